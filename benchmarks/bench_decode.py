@@ -0,0 +1,52 @@
+"""CPU and allocations per meter tick for the body decode paths, on recorded payloads.
+
+``text + json`` is the original path (``resp.text()`` for the error
+preview, then ``resp.json()`` decoding the body to str a second time); ``bytes, json`` and ``bytes, orjson`` are the single-pass
+decode the client uses now, depending on whether orjson is installed.
+Each tick also runs the parser, as the coordinator does.
+"""
+from __future__ import annotations
+import itertools, json, tracemalloc
+
+from .common import load_module, load_payloads, per_call_us
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+
+def peak_per_tick(func, body: bytes) -> int:
+    """Peak bytes allocated while handling one body, i.e. the transient object tree."""
+    func(body)  # leave one-off first-call allocations out of the measurement
+    tracemalloc.start()
+    tracemalloc.reset_peak()
+    func(body)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return peak
+
+
+def main(number: int = 20000) -> None:
+    parser = load_module("parser")
+    bodies = [json.dumps(p).encode() for p in load_payloads("energy_meter")]
+    cycle = itertools.cycle(bodies)
+
+    paths = {
+        "text + json": lambda body: (body.decode("utf-8"), parser.parse_meter_payload(json.loads(body.decode("utf-8")))),
+        "bytes, json": lambda body: parser.parse_meter_payload(json.loads(body)),
+    }
+    if orjson is not None:
+        paths["bytes, orjson"] = lambda body: parser.parse_meter_payload(orjson.loads(body))
+    else:
+        print("orjson not installed, skipping")
+
+    print(f"{len(bodies)} recorded payloads, {len(bodies[0])} bytes each")
+    for name, func in paths.items():
+        cpu = per_call_us(lambda: func(next(cycle)), number)
+        peak = peak_per_tick(func, bodies[0])
+        print(f"{name:<14}: {cpu:7.2f} us/tick, peak {peak / 1024:6.1f} KiB/tick")
+
+
+if __name__ == "__main__":
+    main()
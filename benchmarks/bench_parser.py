@@ -0,0 +1,52 @@
+"""Per-payload parse cost of the energy-meter parser on recorded payloads."""
+from __future__ import annotations
+import itertools
+
+from .common import load_module, load_payloads, per_call_us
+
+
+def legacy_parse(payload):
+    """The if/elif chain the integration used before the dispatch table."""
+    result = {}
+    for block in payload:
+        for sv in block.get("sampledValue", []):
+            meas = sv.get("measurand")
+            phase = sv.get("phase")
+            raw = sv.get("value")
+            if raw is None:
+                continue
+            try:
+                val = float(raw)
+            except (ValueError, TypeError):
+                continue
+            if meas == "Current.Import":
+                if phase == "L1": result["current_l1"] = val
+                elif phase == "L2": result["current_l2"] = val
+                elif phase == "L3": result["current_l3"] = val
+            elif meas == "Voltage":
+                if phase == "L1-N": result["voltage_l1"] = val
+                elif phase == "L2-N": result["voltage_l2"] = val
+                elif phase == "L3-N": result["voltage_l3"] = val
+            elif meas == "Energy.Active.Import.Register":
+                result["energy"] = val
+            elif meas == "Power.Active.Import":
+                result["power"] = val
+    return result
+
+
+def main(number: int = 20000) -> None:
+    parser = load_module("parser")
+    payloads = load_payloads("energy_meter")
+    cycle = itertools.cycle(payloads)
+
+    keys = parser.parse_meter_payload(payloads[0])
+    print(f"{len(payloads)} recorded payloads, {sum(len(b['sampledValue']) for b in payloads[0])} sampledValues each")
+    print(f"legacy if/elif : {per_call_us(lambda: legacy_parse(next(cycle)), number):7.2f} us/payload, {len(legacy_parse(payloads[0]))} keys")
+    print(f"dispatch table : {per_call_us(lambda: parser.parse_meter_payload(next(cycle)), number):7.2f} us/payload, {len(keys)} keys")
+    # Same table restricted to the original eight keys, for a like-for-like comparison
+    table = parser.build_table(parser.MEASURANDS[:8])
+    print(f"table, 8 keys  : {per_call_us(lambda: parser.parse_meter_payload(next(cycle), table), number):7.2f} us/payload")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,152 @@
+"""Polling engine and config flow under load, against the local device emulator.
+
+Needs Home Assistant installed (the integration's coordinators run for real;
+only the device is emulated). Run from the repository root::
+
+    python -m benchmarks.bench_polling --units 20 --ticks 30 --latency 0.02 --error-rate 0.02
+"""
+from __future__ import annotations
+import argparse, asyncio, logging, tempfile, time
+
+from homeassistant.core import HomeAssistant
+from homeassistant.helpers import device_registry as dr
+
+from custom_components.garo_entity_balance_meter import coordinator as coordinator_module
+from custom_components.garo_entity_balance_meter.client import GaroClient
+from custom_components.garo_entity_balance_meter.config_flow import _async_validate_input
+from custom_components.garo_entity_balance_meter.const import (
+    CONF_HOST, CONF_USERNAME, CONF_PASSWORD, CONF_USE_HTTP, HUB_MAX_CONCURRENT_REQUESTS,
+)
+from custom_components.garo_entity_balance_meter.coordinator import GaroMeterCoordinator, GaroDiagnosticsCoordinator
+from custom_components.garo_entity_balance_meter.energy import GaroEnergyGuard
+from custom_components.garo_entity_balance_meter.fetch import FetchEngine
+from custom_components.garo_entity_balance_meter.hub import GaroHub
+from custom_components.garo_entity_balance_meter.identity import GaroIdentityCache
+
+from .common import percentiles
+from .emulator import EmulatorConfig, GaroEmulator
+
+
+class LoopMonitor:
+    """Measure how late a short periodic sleep wakes up, i.e. how long the loop was blocked."""
+
+    def __init__(self, period: float = 0.005) -> None:
+        self.period = period
+        self.lags: list[float] = []
+        self._task: asyncio.Task | None = None
+
+    async def _run(self) -> None:
+        while True:
+            start = time.perf_counter()
+            await asyncio.sleep(self.period)
+            self.lags.append(max(time.perf_counter() - start - self.period, 0.0))
+
+    def start(self) -> None:
+        self._task = asyncio.create_task(self._run())
+
+    def stop(self) -> None:
+        if self._task:
+            self._task.cancel()
+
+
+async def _timed(coro) -> tuple[float, bool]:
+    start = time.perf_counter()
+    try:
+        await coro
+    except Exception:
+        return time.perf_counter() - start, False
+    return time.perf_counter() - start, True
+
+
+def _report(label: str, samples: list[float], failures: int = 0) -> None:
+    p50, p95, p99 = (v * 1000 for v in percentiles(samples))
+    print(f"{label:<16}: n={len(samples):<5} p50 {p50:7.2f} ms  p95 {p95:7.2f} ms  p99 {p99:7.2f} ms  failed {failures}")
+
+
+async def _run(args: argparse.Namespace) -> None:
+    # Ticks run back to back, so the replayed energy register rises faster than any real load
+    logging.getLogger("custom_components.garo_entity_balance_meter.energy").setLevel(logging.ERROR)
+    emulator = GaroEmulator(EmulatorConfig(latency=args.latency, jitter=args.jitter, error_rate=args.error_rate))
+    await emulator.async_start()
+    monitor = LoopMonitor()
+    monitor.start()
+
+    # Time spent in the parser, separate from the fetch
+    parse_times: list[float] = []
+    parse = coordinator_module.parse_meter_payload
+
+    def timed_parse(payload):
+        start = time.perf_counter()
+        try:
+            return parse(payload)
+        finally:
+            parse_times.append(time.perf_counter() - start)
+
+    coordinator_module.parse_meter_payload = timed_parse
+
+    with tempfile.TemporaryDirectory() as config_dir:
+        hass = HomeAssistant(config_dir)
+        await dr.async_load(hass)
+        data = {CONF_HOST: emulator.host, CONF_USERNAME: "admin", CONF_PASSWORD: "admin", CONF_USE_HTTP: True}
+
+        # --- Config flow validation, all units at once ---
+        results = await asyncio.gather(*(_timed(_async_validate_input(hass, data)) for _ in range(args.units)))
+        _report("config flow", [t for t, _ in results], sum(not ok for _, ok in results))
+
+        hub = GaroHub(HUB_MAX_CONCURRENT_REQUESTS if args.units > 1 else None)
+        meters, diagnostics, clients = [], [], []
+        for index in range(args.units):
+            client = GaroClient(emulator.host, "admin", "admin", use_http=True, limiter=hub.limiter)
+            energy = GaroEnergyGuard(hass, f"bench_{index}")
+            identity = GaroIdentityCache(hass, f"bench_{index}")
+            clients.append(client)
+            meters.append(GaroMeterCoordinator(hass, client, args.interval, energy))
+            diagnostics.append(GaroDiagnosticsCoordinator(hass, FetchEngine(client), args.interval * 20, identity, ("bench", str(index))))
+
+        # --- Fast ticks, with a slow diagnostics batch every --slow-every ticks ---
+        meter_times: list[float] = []
+        diag_times: list[float] = []
+        meter_failed = diag_failed = 0
+        tick_requests: list[int] = []
+        for tick in range(args.ticks):
+            before = sum(emulator.requests.values())
+            results = await asyncio.gather(*(_timed(m._async_update_data()) for m in meters))
+            meter_times += [t for t, _ in results]
+            meter_failed += sum(not ok for _, ok in results)
+            if tick % args.slow_every == 0:
+                results = await asyncio.gather(*(_timed(d._async_update_data()) for d in diagnostics))
+                diag_times += [t for t, _ in results]
+                diag_failed += sum(not ok for _, ok in results)
+            tick_requests.append(sum(emulator.requests.values()) - before)
+
+        monitor.stop()
+        _report("meter refresh", meter_times, meter_failed)
+        _report("diagnostics", diag_times, diag_failed)
+        p50, p95, p99 = (v * 1e6 for v in percentiles(parse_times))
+        print(f"{'parse':<16}: n={len(parse_times):<5} p50 {p50:7.1f} us  p95 {p95:7.1f} us  p99 {p99:7.1f} us")
+        print(f"{'requests/tick':<16}: mean {sum(tick_requests) / len(tick_requests):.1f} for {args.units} unit(s), max {max(tick_requests)}")
+        p50, p95, p99 = (v * 1000 for v in percentiles(monitor.lags))
+        print(f"{'loop lag':<16}: p50 {p50:7.2f} ms  p95 {p95:7.2f} ms  p99 {p99:7.2f} ms  max {max(monitor.lags, default=0) * 1000:.2f} ms")
+        print(f"{'connections':<16}: created {sum(c.connections_created for c in clients)}, reused {sum(c.connections_reused for c in clients)}")
+
+        for client in clients:
+            await client.async_close()
+        await emulator.async_stop()
+        await hass.async_stop(force=True)
+    coordinator_module.parse_meter_payload = parse
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--units", type=int, default=10)
+    parser.add_argument("--ticks", type=int, default=20)
+    parser.add_argument("--interval", type=int, default=15, help="nominal fast interval (s); ticks run back to back")
+    parser.add_argument("--slow-every", type=int, default=5)
+    parser.add_argument("--latency", type=float, default=0.01)
+    parser.add_argument("--jitter", type=float, default=0.01)
+    parser.add_argument("--error-rate", type=float, default=0.0)
+    asyncio.run(_run(parser.parse_args()))
+
+
+if __name__ == "__main__":
+    main()
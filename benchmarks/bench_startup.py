@@ -0,0 +1,129 @@
+"""What the integration adds to Home Assistant startup: module import and entry setup.
+
+Needs Home Assistant installed. Import times are measured in fresh
+interpreters that have already imported the Home Assistant modules the
+integration uses, so only the integration's own modules are counted. Entry
+setup runs the real ``async_setup_entry`` of the integration and its sensor
+platform for a hub of emulated units. Run from the repository root::
+
+    python -m benchmarks.bench_startup --units 10 --latency 0.05
+"""
+from __future__ import annotations
+import argparse, asyncio, importlib, json, subprocess, sys, tempfile, time
+
+from .common import ROOT
+from .emulator import EmulatorConfig, GaroEmulator
+
+PACKAGE = "custom_components.garo_entity_balance_meter"
+
+# Loaded by Home Assistant itself before any custom integration
+PRELOAD = (
+    "homeassistant.config_entries", "homeassistant.helpers.update_coordinator",
+    "homeassistant.helpers.entity_platform", "homeassistant.helpers.entity_registry",
+    "homeassistant.helpers.device_registry", "homeassistant.helpers.storage",
+    "homeassistant.components.sensor", "homeassistant.util.ssl", "aiohttp", "orjson",
+)
+
+_IMPORT_SCRIPT = """
+import importlib, json, sys, time
+for name in {preload!r}:
+    importlib.import_module(name)
+result = {{}}
+for name in {targets!r}:
+    before = set(sys.modules)
+    start = time.perf_counter()
+    importlib.import_module(name)
+    result[name] = (time.perf_counter() - start, sorted(m for m in set(sys.modules) - before if m.startswith({package!r})))
+print(json.dumps(result))
+"""
+
+
+def import_times(runs: int = 5) -> dict[str, tuple[float, list[str]]]:
+    """Best of ``runs`` fresh interpreters: seconds and modules pulled in per import step."""
+    script = _IMPORT_SCRIPT.format(preload=PRELOAD, targets=(PACKAGE, f"{PACKAGE}.sensor"), package=PACKAGE)
+    best: dict[str, tuple[float, list[str]]] = {}
+    for _ in range(runs):
+        out = subprocess.run([sys.executable, "-c", script], cwd=ROOT, capture_output=True, text=True, check=True)
+        for name, (elapsed, modules) in json.loads(out.stdout).items():
+            if name not in best or elapsed < best[name][0]:
+                best[name] = (elapsed, modules)
+    return best
+
+
+class _ConfigEntries:
+    """The part of ``hass.config_entries`` the integration's setup uses."""
+
+    def __init__(self, hass) -> None:
+        self.hass = hass
+        self.entities: list = []
+        self.platform_time = 0.0
+
+    async def async_forward_entry_setups(self, entry, platforms) -> None:
+        for platform in platforms:
+            start = time.perf_counter()
+            module = importlib.import_module(f"{PACKAGE}.{platform}")
+            await module.async_setup_entry(self.hass, entry, lambda new, update_before_add=False: self.entities.extend(new))
+            self.platform_time += time.perf_counter() - start
+
+    async def async_unload_platforms(self, entry, platforms) -> bool:
+        return True
+
+
+async def _setup(args: argparse.Namespace) -> None:
+    from homeassistant.config_entries import ConfigEntry
+    from homeassistant.core import HomeAssistant
+    from homeassistant.helpers import device_registry as dr, entity_registry as er
+
+    component = importlib.import_module(PACKAGE)
+    const = importlib.import_module(f"{PACKAGE}.const")
+    emulators = [GaroEmulator(EmulatorConfig(latency=args.latency, jitter=0.0)) for _ in range(args.units)]
+    for emulator in emulators:
+        await emulator.async_start()
+
+    with tempfile.TemporaryDirectory() as config_dir:
+        hass = HomeAssistant(config_dir)
+        await dr.async_load(hass)
+        await er.async_load(hass)
+        hass.config_entries = _ConfigEntries(hass)
+        entry = ConfigEntry(
+            version=1, minor_version=1, domain=const.DOMAIN, title="bench", source="user", options={},
+            data={
+                const.CONF_HUB: args.units > 1, const.CONF_USE_HTTP: True,
+                const.CONF_DEVICES: [
+                    {const.CONF_HOST: e.host, const.CONF_USERNAME: "admin", const.CONF_PASSWORD: "admin"} for e in emulators
+                ],
+                # Single-device entries carry the unit at the top level
+                const.CONF_HOST: emulators[0].host, const.CONF_USERNAME: "admin", const.CONF_PASSWORD: "admin",
+            },
+        )
+
+        start = time.perf_counter()
+        await component.async_setup_entry(hass, entry)
+        total = time.perf_counter() - start
+        platform = hass.config_entries.platform_time
+        print(f"{'entry setup':<16}: {total * 1000:8.1f} ms for {args.units} unit(s), latency {args.latency * 1000:.0f} ms")
+        print(f"{'  probe':<16}: {(total - platform) * 1000:8.1f} ms")
+        print(f"{'  platform':<16}: {platform * 1000:8.1f} ms, {len(hass.config_entries.entities)} entities built")
+
+        # Stopping cancels the background first refreshes before the clients close
+        await hass.async_stop(force=True)
+        await component.async_unload_entry(hass, entry)
+        for emulator in emulators:
+            await emulator.async_stop()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--units", type=int, default=5)
+    parser.add_argument("--latency", type=float, default=0.02)
+    parser.add_argument("--runs", type=int, default=5, help="fresh interpreters for the import times")
+    args = parser.parse_args()
+
+    for name, (elapsed, modules) in import_times(args.runs).items():
+        short = [m.rsplit(".", 1)[-1] for m in modules if m != PACKAGE]
+        print(f"import {name.rsplit('.', 1)[-1]:<25}: {elapsed * 1000:6.1f} ms  ({', '.join(short) or 'package only'})")
+    asyncio.run(_setup(args))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,119 @@
+"""Behaviour check of push mode against the emulator's /hal/output stream.
+
+Needs Home Assistant installed. Runs the real GaroEventStream and meter
+coordinator with short timeouts and checks that events pause polling, a
+silent stream resumes it, a rejected stream is retried with a doubling
+backoff, and events close a breaker that failed polls opened. Exits non-zero on the first failed check::
+
+    python -m benchmarks.check_stream
+"""
+from __future__ import annotations
+import asyncio, logging, sys, tempfile, time
+
+from homeassistant.core import HomeAssistant
+
+from custom_components.garo_entity_balance_meter.client import GaroClient
+from custom_components.garo_entity_balance_meter.const import BREAKER_FAILURE_THRESHOLD
+from custom_components.garo_entity_balance_meter.coordinator import GaroMeterCoordinator
+from custom_components.garo_entity_balance_meter.energy import GaroEnergyGuard
+from custom_components.garo_entity_balance_meter.stream import GaroEventStream, parse_event_line
+
+from .emulator import EmulatorConfig, GaroEmulator
+
+STALL = 0.5
+BACKOFF_MIN, BACKOFF_MAX = 0.1, 0.4
+
+
+class _Entry:
+    """The part of a ConfigEntry that GaroEventStream.async_start uses."""
+
+    def __init__(self) -> None:
+        self.unloads = []
+
+    def async_create_background_task(self, hass, target, name):
+        return hass.async_create_background_task(target, name)
+
+    def async_on_unload(self, func) -> None:
+        self.unloads.append(func)
+
+
+def _check(label: str, ok: bool, detail: str = "") -> None:
+    print(f"{'ok  ' if ok else 'FAIL'} {label}{f' ({detail})' if detail else ''}")
+    if not ok:
+        sys.exit(1)
+
+
+async def _wait_for(condition, timeout: float) -> bool:
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        if condition():
+            return True
+        await asyncio.sleep(0.02)
+    return condition()
+
+
+async def _run() -> None:
+    # The replay runs far faster than real time
+    logging.getLogger("custom_components.garo_entity_balance_meter.energy").setLevel(logging.ERROR)
+    _check("event line parses", bool(parse_event_line(b'{"sampledValue": [{"measurand": "Power.Active.Import", "value": "5"}]}')))
+    _check("non-meter line ignored", parse_event_line(b'{"button": 1}') is None)
+
+    emulator = GaroEmulator(EmulatorConfig(stream_interval=0.05))
+    await emulator.async_start()
+    with tempfile.TemporaryDirectory() as config_dir:
+        hass = HomeAssistant(config_dir)
+        client = GaroClient(emulator.host, "admin", "admin", use_http=True)
+        meter = GaroMeterCoordinator(hass, client, 15, GaroEnergyGuard(hass, "check"), push=True)
+        stream = GaroEventStream(hass, client, meter, stall_timeout=STALL, backoff_min=BACKOFF_MIN, backoff_max=BACKOFF_MAX)
+        entry = _Entry()
+        stream.async_start(entry)
+
+        # --- Events pause polling ---
+        ok = await _wait_for(lambda: stream.events >= 3, 5)
+        _check("events pause polling", ok and meter.update_interval is None and bool(meter.data), f"{stream.events} events")
+
+        # --- A silent stream resumes polling after the stall timeout ---
+        emulator.stream_paused = True
+        ok = await _wait_for(lambda: meter.update_interval is not None, STALL * 3)
+        _check("stall resumes polling", ok, f"interval {meter.update_interval}")
+
+        # --- A rejected stream is retried with a doubling, capped backoff ---
+        emulator.config.stream_status = 503
+        start = len(emulator.stream_connects)
+        await _wait_for(lambda: len(emulator.stream_connects) >= start + 5, STALL + 4 * BACKOFF_MAX + 2)
+        connects = emulator.stream_connects[start:]
+        gaps = [round(b - a, 2) for a, b in zip(connects, connects[1:])]
+        expected = [min(BACKOFF_MIN * 2 ** (i + 1), BACKOFF_MAX) for i in range(len(gaps))]
+        _check(
+            "reconnect backs off",
+            len(gaps) >= 3 and all(e * 0.9 <= g <= e + 0.2 for g, e in zip(gaps, expected)),
+            f"gaps {gaps}, expected {expected}",
+        )
+
+        # --- Events after a reconnect pause polling again ---
+        emulator.stream_paused = False
+        emulator.config.stream_status = 200
+        events = stream.events
+        ok = await _wait_for(lambda: stream.events > events and meter.update_interval is None, BACKOFF_MAX + 2)
+        _check("stream recovers", ok)
+
+        # --- Events close a breaker the fallback polls opened ---
+        for _ in range(BREAKER_FAILURE_THRESHOLD):
+            client.breaker.record_failure()
+        opened = client.breaker.state
+        ok = await _wait_for(lambda: client.breaker.closed, STALL)
+        _check("events close the breaker", opened == "open" and ok, f"{opened} -> {client.breaker.state}")
+
+        for unload in entry.unloads:
+            unload()
+        await hass.async_stop(force=True)
+        await client.async_close()
+        await emulator.async_stop()
+
+
+def main() -> None:
+    asyncio.run(_run())
+
+
+if __name__ == "__main__":
+    main()
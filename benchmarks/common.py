@@ -0,0 +1,49 @@
+"""Shared helpers for the offline benchmarks.
+
+Run from the repository root, e.g. ``python -m benchmarks.bench_parser``.
+"""
+from __future__ import annotations
+import importlib.util, json, sys, time
+from pathlib import Path
+from types import ModuleType
+from typing import Any, Callable
+
+ROOT = Path(__file__).resolve().parent.parent
+COMPONENT = ROOT / "custom_components" / "garo_entity_balance_meter"
+PAYLOADS = Path(__file__).resolve().parent / "payloads"
+
+
+def load_module(name: str) -> ModuleType:
+    """Load a self-contained integration module by file, without importing Home Assistant.
+
+    Only modules free of Home Assistant and package-relative imports load
+    this way: parser, stats, metrics and phases. Keep them so.
+    """
+    spec = importlib.util.spec_from_file_location(f"garo_bench_{name}", COMPONENT / f"{name}.py")
+    module = importlib.util.module_from_spec(spec)
+    sys.modules[spec.name] = module
+    spec.loader.exec_module(module)
+    return module
+
+
+def load_payloads(name: str) -> list[Any]:
+    return json.loads((PAYLOADS / f"{name}.json").read_text())
+
+
+def per_call_us(func: Callable[[], Any], number: int) -> float:
+    """Best of five runs, in microseconds per call."""
+    best = float("inf")
+    for _ in range(5):
+        start = time.perf_counter()
+        for _ in range(number):
+            func()
+        best = min(best, time.perf_counter() - start)
+    return best / number * 1e6
+
+
+def percentiles(samples: list[float], pcts: tuple[int, ...] = (50, 95, 99)) -> list[float]:
+    """Nearest-rank percentiles of ``samples``; zeros when there are none."""
+    if not samples:
+        return [0.0] * len(pcts)
+    ordered = sorted(samples)
+    return [ordered[min(len(ordered) - 1, int(p / 100 * len(ordered)))] for p in pcts]
@@ -0,0 +1,205 @@
+"""Local emulator of the Entity Balance REST API for offline benchmarks.
+
+Serves the read endpoints the integration uses behind BasicAuth, replays
+recorded energy-meter payloads in order (energy registers keep counting up
+across repeats) and answers the other endpoints from ``payloads/device.json``
+with ETags. Latency, 500 errors and hung
+requests can be injected per request. Stand-alone use, e.g. to point a
+development Home Assistant at it::
+
+    python -m benchmarks.emulator --port 8080 --latency 0.05 --error-rate 0.05
+"""
+from __future__ import annotations
+import argparse, asyncio, copy, hashlib, itertools, json, random, time
+from collections import Counter
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Iterator
+
+from aiohttp import BasicAuth, hdrs, web
+
+from .common import PAYLOADS, load_payloads
+
+
+@dataclass
+class EmulatorConfig:
+    username: str = "admin"
+    password: str = "admin"
+    latency: float = 0.0        # s added to every answer
+    jitter: float = 0.0         # s, uniform on top of latency
+    error_rate: float = 0.0     # share of requests answered with 500
+    hang_rate: float = 0.0      # share of requests that never answer
+    stream_interval: float = 1.0
+    stream_status: int = 200    # answer to /hal/output; anything else rejects the stream
+
+
+class GaroEmulator:
+    """One emulated unit. ``requests`` counts answered requests per path."""
+
+    def __init__(
+        self,
+        config: EmulatorConfig | None = None,
+        meter_payloads: list[Any] | None = None,
+        fixtures: dict[str, Any] | None = None,
+        *,
+        seed: int = 0,
+    ) -> None:
+        self.config = config or EmulatorConfig()
+        self._meter = self._replay(meter_payloads or load_payloads("energy_meter"))
+        self._fixtures = fixtures or load_payloads("device")
+        self._random = random.Random(seed)
+        self.requests: Counter[str] = Counter()
+        self.stream_connects: list[float] = []   # monotonic time of every /hal/output request
+        self.stream_paused = False               # keep stream connections open but silent
+        self.port = 0
+        self._runner: web.AppRunner | None = None
+
+        app = web.Application(middlewares=[self._middleware])
+        app.router.add_get("/status/energy-meter", self._energy_meter)
+        app.router.add_get("/status/energy-meter-ocmf-xml", self._ocmf_xml)
+        app.router.add_get("/config/config-parameter", self._config_parameter)
+        app.router.add_get("/factory/config-parameter", self._config_parameter)
+        app.router.add_get("/hal/output", self._hal_output)
+        for path in self._fixtures:
+            if path.startswith("/"):
+                app.router.add_get(path, self._fixture)
+        self.app = app
+
+    @staticmethod
+    def _replay(payloads: list[Any]) -> Iterator[Any]:
+        """Cycle through ``payloads``, shifting the energy registers by their span on every repeat."""
+        def registers(payload):
+            blocks = payload if isinstance(payload, list) else [payload]
+            return [sv for block in blocks for sv in block.get("sampledValue", []) if sv.get("measurand", "").endswith(".Register")]
+
+        first, last = registers(payloads[0]), registers(payloads[-1])
+        # One average step on top of the span so the repeat does not stand still
+        spans = [
+            (float(b["value"]) - float(a["value"])) * len(payloads) / max(len(payloads) - 1, 1)
+            for a, b in zip(first, last)
+        ]
+        for repeat in itertools.count():
+            for payload in payloads:
+                if repeat:
+                    payload = copy.deepcopy(payload)
+                    for sv, span in zip(registers(payload), spans):
+                        sv["value"] = f"{float(sv['value']) + span * repeat:.3f}"
+                yield payload
+
+    @property
+    def host(self) -> str:
+        return f"127.0.0.1:{self.port}"
+
+    async def async_start(self, host: str = "127.0.0.1", port: int = 0) -> None:
+        self._runner = web.AppRunner(self.app, access_log=None)
+        await self._runner.setup()
+        site = web.TCPSite(self._runner, host, port)
+        await site.start()
+        self.port = site._server.sockets[0].getsockname()[1]
+
+    async def async_stop(self) -> None:
+        if self._runner:
+            await self._runner.cleanup()
+
+    @web.middleware
+    async def _middleware(self, request: web.Request, handler) -> web.StreamResponse:
+        cfg = self.config
+        try:
+            auth = BasicAuth.decode(request.headers.get(hdrs.AUTHORIZATION, ""))
+        except ValueError:
+            auth = None
+        if auth is None or (auth.login, auth.password) != (cfg.username, cfg.password):
+            return web.Response(status=401, headers={hdrs.WWW_AUTHENTICATE: 'Basic realm="garo"'})
+        self.requests[request.path] += 1
+        if request.path == "/hal/output":
+            return await handler(request)
+        roll = self._random.random()
+        if roll < cfg.hang_rate:
+            await asyncio.sleep(3600)
+        if cfg.latency or cfg.jitter:
+            await asyncio.sleep(cfg.latency + self._random.uniform(0, cfg.jitter))
+        if roll < cfg.hang_rate + cfg.error_rate:
+            return web.Response(status=500, text="Internal error")
+        return await handler(request)
+
+    @staticmethod
+    def _json(request: web.Request, payload: Any) -> web.Response:
+        body = json.dumps(payload)
+        etag = f'"{hashlib.md5(body.encode()).hexdigest()[:16]}"'
+        if request.headers.get(hdrs.IF_NONE_MATCH) == etag:
+            return web.Response(status=304, headers={hdrs.ETAG: etag})
+        return web.Response(text=body, content_type="application/json", headers={hdrs.ETAG: etag})
+
+    async def _energy_meter(self, request: web.Request) -> web.Response:
+        return web.json_response(next(self._meter))
+
+    async def _fixture(self, request: web.Request) -> web.Response:
+        return self._json(request, self._fixtures[request.path])
+
+    async def _ocmf_xml(self, request: web.Request) -> web.Response:
+        return web.Response(text=self._fixtures.get("ocmf-xml", ""), content_type="application/xml")
+
+    async def _config_parameter(self, request: web.Request) -> web.Response:
+        groups = self._fixtures.get("config-parameter", {})
+        group, parameter = request.query.get("group"), request.query.get("parameter")
+        if group is None:
+            return self._json(request, sorted(groups))
+        if group not in groups or (parameter is not None and parameter not in groups[group]):
+            return web.Response(status=404, text="Unknown parameter")
+        # As in the swagger spec: a group lists its parameter names, a parameter answers its value
+        if parameter is None:
+            return self._json(request, sorted(groups[group]))
+        return self._json(request, groups[group][parameter])
+
+    async def _hal_output(self, request: web.Request) -> web.StreamResponse:
+        self.stream_connects.append(time.monotonic())
+        if self.config.stream_status != 200:
+            return web.Response(status=self.config.stream_status, text="Stream unavailable")
+        resp = web.StreamResponse(headers={hdrs.CONTENT_TYPE: "text/plain"})
+        await resp.prepare(request)
+        try:
+            while True:
+                if not self.stream_paused:
+                    await resp.write(json.dumps(next(self._meter)).encode() + b"\n")
+                await asyncio.sleep(self.config.stream_interval)
+        except ConnectionResetError:
+            pass
+        return resp
+
+
+async def _serve(args: argparse.Namespace) -> None:
+    payloads = json.loads(Path(args.replay).read_text()) if args.replay else None
+    emulator = GaroEmulator(
+        EmulatorConfig(
+            username=args.username, password=args.password, latency=args.latency, jitter=args.jitter,
+            error_rate=args.error_rate, hang_rate=args.hang_rate,
+        ),
+        payloads,
+    )
+    await emulator.async_start(args.bind, args.port)
+    print(f"GARO emulator on http://{args.bind}:{emulator.port} (user {args.username!r}), Ctrl+C to stop")
+    try:
+        await asyncio.Event().wait()
+    finally:
+        await emulator.async_stop()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--bind", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8080)
+    parser.add_argument("--username", default="admin")
+    parser.add_argument("--password", default="admin")
+    parser.add_argument("--latency", type=float, default=0.0)
+    parser.add_argument("--jitter", type=float, default=0.0)
+    parser.add_argument("--error-rate", type=float, default=0.0)
+    parser.add_argument("--hang-rate", type=float, default=0.0)
+    parser.add_argument("--replay", help=f"JSON list of energy-meter payloads (default: {PAYLOADS / 'energy_meter.json'})")
+    try:
+        asyncio.run(_serve(parser.parse_args()))
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()
@@ -1,61 +1,94 @@
 from __future__ import annotations
-import logging, asyncio, aiohttp
-from homeassistant.core import HomeAssistant
+import logging, asyncio, importlib, time
+from homeassistant.core import Event, HomeAssistant
+from homeassistant.const import EVENT_HOMEASSISTANT_CLOSE
 from homeassistant.config_entries import ConfigEntry
-from homeassistant.helpers import aiohttp_client
 from homeassistant.exceptions import ConfigEntryNotReady
 
 from .const import (
     DOMAIN, PLATFORMS,
     CONF_HOST, CONF_USERNAME, CONF_PASSWORD,
-    CONF_IGNORE_TLS_ERRORS, CONF_USE_HTTP,
-    API_PATH,
+    CONF_IGNORE_TLS_ERRORS, CONF_USE_HTTP, CONF_HUB, CONF_DEVICES,
+    HUB_MAX_CONCURRENT_REQUESTS,
 )
+from .client import GaroClient
+from .hub import GaroHub
 
 _LOGGER = logging.getLogger(__name__)
 
 
+def _import_platforms() -> None:
+    """Import the platform modules (coordinators, parser, HA sensor helpers) off the event loop."""
+    for platform in PLATFORMS:
+        importlib.import_module(f"{__name__}.{platform}")
+
+
 async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
+    started = time.monotonic()
     hass.data.setdefault(DOMAIN, {})
 
     def opt(key, default=None):
         return entry.options.get(key, entry.data.get(key, default))
 
-    host = opt(CONF_HOST)
-    username = opt(CONF_USERNAME)
-    password = opt(CONF_PASSWORD)
-
-    if not host or not username or not password:
-        raise ConfigEntryNotReady(
-            "Credentials missing from config entry — please delete and re-add this integration"
-        )
-
     ignore_tls = opt(CONF_IGNORE_TLS_ERRORS, True)
     use_http = opt(CONF_USE_HTTP, False)
-    scheme = "http" if use_http else "https"
-    url = f"{scheme}://{host}{API_PATH}"
-
-    session = aiohttp_client.async_get_clientsession(hass, verify_ssl=not ignore_tls)
-    try:
-        async with asyncio.timeout(15):
-            async with session.get(url, auth=aiohttp.BasicAuth(username, password)) as resp:
-                txt = await resp.text()
-                if resp.status in (401, 403):
-                    raise ConfigEntryNotReady(f"Authentication failed (status {resp.status})")
-                if resp.status >= 400:
-                    raise ConfigEntryNotReady(f"HTTP {resp.status}: {txt[:120]}")
-    except (aiohttp.ClientError, asyncio.TimeoutError) as err:
-        raise ConfigEntryNotReady(f"Connection error: {err}") from err
+
+    if entry.data.get(CONF_HUB):
+        units = entry.data.get(CONF_DEVICES) or []
+        hub = GaroHub(HUB_MAX_CONCURRENT_REQUESTS)
+    else:
+        units = [{key: opt(key) for key in (CONF_HOST, CONF_USERNAME, CONF_PASSWORD)}]
+        hub = GaroHub(None)
+
+    for unit in units:
+        if not unit.get(CONF_HOST) or not unit.get(CONF_USERNAME) or not unit.get(CONF_PASSWORD):
+            raise ConfigEntryNotReady(
+                "Credentials missing from config entry — please delete and re-add this integration"
+            )
+
+    clients = [
+        GaroClient(
+            unit[CONF_HOST], unit[CONF_USERNAME], unit[CONF_PASSWORD],
+            use_http=use_http, verify_ssl=not ignore_tls, limiter=hub.limiter,
+        )
+        for unit in units
+    ]
+    # The platform import runs in the executor while the probe waits on the network
+    platforms = hass.async_add_executor_job(_import_platforms)
+    results = await asyncio.gather(*(client.async_probe() for client in clients), return_exceptions=True)
+    await platforms
+    errors = [res for res in results if isinstance(res, Exception)]
+    if len(errors) == len(clients):
+        for client in clients:
+            await client.async_close()
+        err = errors[0] if errors else None
+        raise ConfigEntryNotReady(str(err) if err else "No units configured") from err
+    for client, res in zip(clients, results):
+        # In hub mode one unreachable unit must not keep the rest offline
+        if isinstance(res, Exception):
+            _LOGGER.warning("Unit %s did not answer the setup probe: %s", client.host, res)
+    probed = time.monotonic()
 
     hass.data[DOMAIN][entry.entry_id] = {
-        CONF_HOST: host,
-        "use_http": use_http,
-        "session": session,
+        "hub": hub,
+        "clients": clients,
+        "devices": {},
     }
 
     await hass.config_entries.async_forward_entry_setups(entry, PLATFORMS)
     entry.async_on_unload(entry.add_update_listener(_async_reload_entry))
 
+    async def _async_close_clients(event: Event) -> None:
+        for client in clients:
+            await client.async_close()
+
+    # Unload is not called on shutdown; close the dedicated sessions then too
+    entry.async_on_unload(hass.bus.async_listen_once(EVENT_HOMEASSISTANT_CLOSE, _async_close_clients))
+    _LOGGER.info(
+        "Setup of %s finished in %.2fs (probe %.2fs)",
+        entry.title, time.monotonic() - started, probed - started,
+    )
+
     return True
 
 
@@ -66,5 +99,8 @@ async def _async_reload_entry(hass: HomeAssistant, entry: ConfigEntry) -> None:
 async def async_unload_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
     unload_ok = await hass.config_entries.async_unload_platforms(entry, PLATFORMS)
     if unload_ok:
-        hass.data[DOMAIN].pop(entry.entry_id, None)
+        data = hass.data[DOMAIN].pop(entry.entry_id, None)
+        if data:
+            for client in data["clients"]:
+                await client.async_close()
     return unload_ok
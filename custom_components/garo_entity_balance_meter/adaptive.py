@@ -0,0 +1,66 @@
+"""Adaptive meter poll interval driven by load volatility and device latency."""
+from __future__ import annotations
+from typing import Any
+
+from .const import (
+    ADAPTIVE_MIN_INTERVAL, ADAPTIVE_MAX_FACTOR, ADAPTIVE_GROWTH,
+    ADAPTIVE_POWER_DELTA, ADAPTIVE_POWER_RATIO, ADAPTIVE_CURRENT_DELTA,
+    ADAPTIVE_LATENCY_FACTOR, ADAPTIVE_ERROR_PENALTY, ADAPTIVE_EWMA_ALPHA,
+)
+
+_CURRENT_KEYS = ("current_l1", "current_l2", "current_l3")
+
+
+class AdaptiveInterval:
+    """Pick the next poll interval from the last two samples.
+
+    A jump in ``power`` or any ``current_l*`` drops straight to the minimum
+    interval; every stable sample stretches it by ADAPTIVE_GROWTH up to
+    ``base * ADAPTIVE_MAX_FACTOR``. Slow answers and a rising error rate
+    raise the floor, so a struggling device is never polled harder.
+    """
+
+    def __init__(self, base: float) -> None:
+        self.base = base
+        self.cap = max(base * ADAPTIVE_MAX_FACTOR, ADAPTIVE_MIN_INTERVAL)
+        self.interval = base
+        self.latency = 0.0
+        self.error_rate = 0.0
+        self._prev: dict[str, Any] | None = None
+
+    def _volatile(self, values: dict[str, Any]) -> bool:
+        prev = self._prev
+        if prev is None:
+            return False
+        power, prev_power = values.get("power"), prev.get("power")
+        if power is not None and prev_power is not None:
+            if abs(power - prev_power) >= max(ADAPTIVE_POWER_DELTA, ADAPTIVE_POWER_RATIO * abs(prev_power)):
+                return True
+        for key in _CURRENT_KEYS:
+            cur, prev_cur = values.get(key), prev.get(key)
+            if cur is not None and prev_cur is not None and abs(cur - prev_cur) >= ADAPTIVE_CURRENT_DELTA:
+                return True
+        return False
+
+    def observe(self, values: dict[str, Any], latency: float) -> float:
+        """Feed a successful sample and its fetch latency; return the next interval in seconds."""
+        self.latency += ADAPTIVE_EWMA_ALPHA * (latency - self.latency)
+        self.error_rate -= ADAPTIVE_EWMA_ALPHA * self.error_rate
+        if self._volatile(values):
+            interval = ADAPTIVE_MIN_INTERVAL
+        else:
+            interval = min(self.interval * ADAPTIVE_GROWTH, self.cap)
+        self._prev = values
+        self.interval = max(interval, self._floor())
+        return self.interval
+
+    def observe_error(self) -> None:
+        self.error_rate += ADAPTIVE_EWMA_ALPHA * (1.0 - self.error_rate)
+        self.interval = max(self.interval, self._floor())
+
+    def _floor(self) -> float:
+        return min(
+            max(ADAPTIVE_MIN_INTERVAL, self.latency * ADAPTIVE_LATENCY_FACTOR)
+            * (1.0 + ADAPTIVE_ERROR_PENALTY * self.error_rate),
+            self.cap,
+        )
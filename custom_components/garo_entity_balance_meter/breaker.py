@@ -0,0 +1,81 @@
+"""Per-unit circuit breaker with jittered exponential backoff."""
+from __future__ import annotations
+import logging, random, time
+from typing import Callable
+
+from .const import BREAKER_FAILURE_THRESHOLD, BREAKER_BACKOFF_MIN, BREAKER_BACKOFF_MAX
+
+_LOGGER = logging.getLogger(__name__)
+
+STATE_CLOSED = "closed"
+STATE_OPEN = "open"
+STATE_HALF_OPEN = "half_open"
+
+
+class CircuitBreaker:
+    """Stop talking to a unit that keeps failing.
+
+    ``closed``: requests flow; BREAKER_FAILURE_THRESHOLD transport failures in
+    a row open the breaker. ``open``: requests fail at once until the backoff
+    has passed; the backoff doubles with every failed probe and is jittered so
+    units that dropped together do not come back in lockstep. ``half_open``:
+    one probe is in flight; its outcome closes or re-opens the breaker.
+    """
+
+    def __init__(self, name: str) -> None:
+        self.name = name
+        self.state = STATE_CLOSED
+        self.failures = 0
+        self.opened = 0              # consecutive openings, drives the backoff
+        self.retry_at = 0.0
+        self._listeners: list[Callable[[], None]] = []
+
+    @property
+    def closed(self) -> bool:
+        return self.state == STATE_CLOSED
+
+    def add_listener(self, listener: Callable[[], None]) -> Callable[[], None]:
+        """Call ``listener`` on every state change; returns a function that removes it."""
+        self._listeners.append(listener)
+        return lambda: self._listeners.remove(listener)
+
+    def _set_state(self, state: str) -> None:
+        if state != self.state:
+            self.state = state
+            for listener in list(self._listeners):
+                listener()
+
+    def probe_due(self) -> bool:
+        return self.state == STATE_OPEN and time.monotonic() >= self.retry_at
+
+    def start_probe(self) -> None:
+        self._set_state(STATE_HALF_OPEN)
+
+    def record_success(self) -> None:
+        if self.state != STATE_CLOSED:
+            _LOGGER.info("%s reachable again, resuming requests", self.name)
+        self.failures = 0
+        self.opened = 0
+        self._set_state(STATE_CLOSED)
+
+    def record_failure(self) -> None:
+        self.failures += 1
+        if self.state == STATE_CLOSED and self.failures < BREAKER_FAILURE_THRESHOLD:
+            return
+        backoff = min(BREAKER_BACKOFF_MIN * 2 ** self.opened, BREAKER_BACKOFF_MAX)
+        delay = random.uniform(backoff / 2, backoff)
+        self.opened += 1
+        self.retry_at = time.monotonic() + delay
+        if self.state == STATE_CLOSED:
+            _LOGGER.warning("%s unreachable after %d failures, pausing requests for %.0fs", self.name, self.failures, delay)
+        else:
+            _LOGGER.debug("%s probe failed, next probe in %.0fs", self.name, delay)
+        self._set_state(STATE_OPEN)
+
+    def as_dict(self) -> dict:
+        return {
+            "state": self.state,
+            "failures": self.failures,
+            "opened": self.opened,
+            "retry_in": round(max(self.retry_at - time.monotonic(), 0), 1) if self.state == STATE_OPEN else None,
+        }
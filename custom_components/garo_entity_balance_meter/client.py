@@ -0,0 +1,267 @@
+"""Async client for the GARO Entity Balance REST API."""
+from __future__ import annotations
+import logging, asyncio, aiohttp, contextlib, time
+from types import SimpleNamespace
+from typing import Any
+
+try:
+    from orjson import loads as json_loads
+except ImportError:  # orjson ships with Home Assistant; stdlib json also takes bytes
+    from json import loads as json_loads
+
+from homeassistant.util.ssl import get_default_context, get_default_no_verify_context
+
+from .metrics import RequestMetrics
+from .breaker import CircuitBreaker
+from .const import (
+    API_PATH, API_PATH_TEMPS, API_PATH_FIRMWARE_VERSION, API_PATH_DEVICE_ID, API_PATH_UNIT_ID,
+    API_PATH_NETWORK_INTERFACE, API_PATH_CONNECTION_STATUS, API_PATH_CSMS_STATUS,
+    API_PATH_WIFI_NETWORKS, API_PATH_CONFIG_PARAMETER, API_PATH_FACTORY_CONFIG_PARAMETER,
+    API_PATH_HAL_BUTTON, API_PATH_HAL_ADC, API_PATH_HAL_GPIO, API_PATH_HAL_OUTPUT,
+    API_PATH_OCMF_XML, API_PATH_PUB_KEY,
+    CLIENT_CONNECTION_LIMIT, CLIENT_KEEPALIVE_TIMEOUT, REQUEST_TIMEOUT, METER_REQUEST_TIMEOUT,
+    BREAKER_PROBE_PATH,
+)
+
+_LOGGER = logging.getLogger(__name__)
+
+
+class GaroError(Exception):
+    """The device could not be reached or returned an unusable answer."""
+
+
+class GaroAuthError(GaroError):
+    """The device rejected the credentials."""
+
+
+class GaroUnavailable(GaroError):
+    """The circuit breaker is open; no request was sent."""
+
+
+def decode_payload(body: bytes) -> Any:
+    """Decode a response body as JSON in one pass, falling back to the stripped text."""
+    try:
+        return json_loads(body)
+    except ValueError:
+        return body.decode(errors="replace").strip()
+
+
+def preview(body: bytes) -> str:
+    """Start of a body for log and error messages."""
+    return body[:120].decode(errors="replace")
+
+
+class GaroClient:
+    """Client for one device with its own pooled keep-alive session.
+
+    The unit is a small embedded host, so the connector keeps a handful of
+    connections alive instead of opening (and TLS-handshaking) one per
+    request, and the BasicAuth header is encoded once. In hub mode all units
+    share one ``limiter`` semaphore that caps requests across the fleet. ``connections_created``
+    and ``connections_reused`` show how well the pool is doing, and ``metrics``
+    keeps per-endpoint counters and latency histograms for the diagnostics download.
+
+    All requests pass ``breaker``: while the unit is unreachable they fail at
+    once, and only the cheap BREAKER_PROBE_PATH is tried once per backoff.
+    Only meter failures and refused connections count towards opening it;
+    a timeout on any other endpoint is left to that endpoint's coordinator.
+
+    The startup probe's energy-meter payload is kept as the first meter
+    sample, so the meter coordinator does not fetch it a second time.
+
+    One-shot users such as the config flow pass Home Assistant's shared
+    ``session`` instead; it is not closed by ``async_close``.
+    """
+
+    def __init__(
+        self,
+        host: str,
+        username: str,
+        password: str,
+        *,
+        use_http: bool = False,
+        verify_ssl: bool = True,
+        limiter: asyncio.Semaphore | None = None,
+        session: aiohttp.ClientSession | None = None,
+    ) -> None:
+        self.host = host
+        self._limiter = limiter or contextlib.nullcontext()
+        self.base_url = f"{'http' if use_http else 'https'}://{host}"
+        self.auth_headers = {aiohttp.hdrs.AUTHORIZATION: aiohttp.BasicAuth(username, password).encode()}
+        self.requests = 0
+        self.connections_created = 0
+        self.connections_reused = 0
+        self.metrics = RequestMetrics()
+        self.breaker = CircuitBreaker(host)
+        self._first_sample: Any = None
+        self._owns_session = session is None
+        if session is not None:
+            self.session = session
+            return
+
+        trace = aiohttp.TraceConfig()
+        trace.on_connection_create_end.append(self._on_connection_created)
+        trace.on_connection_reuseconn.append(self._on_connection_reused)
+        connector = aiohttp.TCPConnector(
+            limit_per_host=CLIENT_CONNECTION_LIMIT,
+            keepalive_timeout=CLIENT_KEEPALIVE_TIMEOUT,
+            # Shared, pre-built contexts: no blocking context creation in the loop
+            ssl=get_default_context() if verify_ssl else get_default_no_verify_context(),
+        )
+        self.session = aiohttp.ClientSession(connector=connector, trace_configs=[trace])
+
+    async def _on_connection_created(self, session, ctx: SimpleNamespace, params) -> None:
+        self.connections_created += 1
+
+    async def _on_connection_reused(self, session, ctx: SimpleNamespace, params) -> None:
+        self.connections_reused += 1
+
+    async def async_close(self) -> None:
+        """Close the dedicated session; the client is unusable afterwards."""
+        if self._owns_session:
+            await self.session.close()
+
+    async def async_request(
+        self,
+        path: str,
+        *,
+        params: dict[str, str] | None = None,
+        headers: dict[str, str] | None = None,
+        timeout: float = REQUEST_TIMEOUT,
+    ) -> tuple[int, Any, bytes]:
+        """GET a path and return ``(status, headers, body)``; transport errors raise GaroError.
+
+        The body is read once as bytes and left to the caller to decode.
+        """
+        breaker = self.breaker
+        if not breaker.closed:
+            await self._async_probe_breaker()
+        try:
+            result = await self._async_send(path, params, headers, timeout)
+        except GaroError as err:
+            # A slow diagnostics endpoint says nothing about the unit being gone
+            if path == API_PATH or isinstance(err.__cause__, aiohttp.ClientConnectorError):
+                breaker.record_failure()
+            raise
+        breaker.record_success()
+        return result
+
+    async def _async_probe_breaker(self) -> None:
+        """Let one cheap request through an open breaker once its backoff has passed."""
+        breaker = self.breaker
+        if not breaker.probe_due():
+            raise GaroUnavailable(f"{self.host} unreachable, requests paused")
+        breaker.start_probe()
+        try:
+            await self._async_send(BREAKER_PROBE_PATH, None, None, REQUEST_TIMEOUT)
+        except GaroError as err:
+            breaker.record_failure()
+            raise GaroUnavailable(f"{self.host} still unreachable") from err
+        breaker.record_success()
+
+    async def _async_send(
+        self, path: str, params: dict[str, str] | None, headers: dict[str, str] | None, timeout: float,
+    ) -> tuple[int, Any, bytes]:
+        url = f"{self.base_url}{path}"
+        start = time.monotonic()
+        try:
+            async with self._limiter, asyncio.timeout(timeout):
+                self.requests += 1
+                start = time.monotonic()  # latency of the device, not of the hub queue
+                async with self.session.get(
+                    url, params=params, headers={**self.auth_headers, **headers} if headers else self.auth_headers,
+                ) as resp:
+                    body = await resp.read()
+                    self.metrics.record(path, resp.status, len(body), time.monotonic() - start)
+                    return resp.status, resp.headers, body
+        except (aiohttp.ClientError, asyncio.TimeoutError) as err:
+            self.metrics.record_failure(path, time.monotonic() - start, timeout=isinstance(err, asyncio.TimeoutError))
+            raise GaroError(f"Connection error: {str(err) or type(err).__name__}") from err
+
+    async def async_get(self, path: str, *, params: dict[str, str] | None = None, timeout: float = REQUEST_TIMEOUT) -> Any:
+        """GET a path that must answer 200 and return its decoded body."""
+        status, _, body = await self.async_request(path, params=params, timeout=timeout)
+        if status in (401, 403):
+            raise GaroAuthError(f"Authentication failed (status {status})")
+        if status != 200:
+            raise GaroError(f"Status {status} from {self.base_url}{path}: {preview(body)}")
+        return decode_payload(body)
+
+    def open_stream(self, path: str, timeout: aiohttp.ClientTimeout) -> Any:
+        """Context manager for a long-lived GET whose body is read incrementally."""
+        return self.session.get(f"{self.base_url}{path}", headers=self.auth_headers, timeout=timeout)
+
+    # --- Status ---
+
+    async def async_get_meter(self) -> Any:
+        """GET /status/energy-meter and return the decoded JSON payload."""
+        payload = await self.async_get(API_PATH, timeout=METER_REQUEST_TIMEOUT)
+        if isinstance(payload, str):
+            _LOGGER.error("JSON decode failed URL=%s%s raw=%s", self.base_url, API_PATH, payload[:120])
+            raise GaroError("JSON decode failed")
+        return payload
+
+    async def async_get_temperatures(self) -> Any:
+        return await self.async_get(API_PATH_TEMPS)
+
+    async def async_get_ocmf_xml(self) -> str:
+        return str(await self.async_get(API_PATH_OCMF_XML))
+
+    async def async_get_pub_key(self) -> str:
+        return str(await self.async_get(API_PATH_PUB_KEY))
+
+    # --- Config ---
+
+    async def async_get_firmware_version(self) -> Any:
+        return await self.async_get(API_PATH_FIRMWARE_VERSION)
+
+    async def async_get_device_id(self) -> Any:
+        return await self.async_get(API_PATH_DEVICE_ID)
+
+    async def async_get_unit_id(self) -> Any:
+        return await self.async_get(API_PATH_UNIT_ID)
+
+    async def async_get_config_parameter(self, group: str | None = None, parameter: str | None = None, *, factory: bool = False) -> Any:
+        """List groups, list a group's parameters, or read one parameter."""
+        params = {k: v for k, v in (("group", group), ("parameter", parameter)) if v is not None}
+        return await self.async_get(API_PATH_FACTORY_CONFIG_PARAMETER if factory else API_PATH_CONFIG_PARAMETER, params=params)
+
+    # --- Netconf ---
+
+    async def async_get_network_interface(self) -> Any:
+        return await self.async_get(API_PATH_NETWORK_INTERFACE)
+
+    async def async_get_connection_status(self, interface_name: str | None = None) -> Any:
+        params = {"interface_name": interface_name} if interface_name else None
+        return await self.async_get(API_PATH_CONNECTION_STATUS, params=params)
+
+    async def async_get_csms_connection_status(self) -> Any:
+        return await self.async_get(API_PATH_CSMS_STATUS)
+
+    async def async_get_wifi_available_networks(self) -> Any:
+        return await self.async_get(API_PATH_WIFI_NETWORKS)
+
+    # --- HAL ---
+
+    async def async_get_button(self) -> Any:
+        return await self.async_get(API_PATH_HAL_BUTTON)
+
+    async def async_get_adc(self) -> Any:
+        return await self.async_get(API_PATH_HAL_ADC)
+
+    async def async_get_gpio(self, gpio_name: str) -> Any:
+        return await self.async_get(API_PATH_HAL_GPIO, params={"gpio_name": gpio_name})
+
+    def open_hal_output(self, timeout: aiohttp.ClientTimeout) -> Any:
+        return self.open_stream(API_PATH_HAL_OUTPUT, timeout)
+
+    # --- Startup probe ---
+
+    async def async_probe(self) -> None:
+        """Validate the connection, keeping the payload as the first meter sample."""
+        self._first_sample = await self.async_get_meter()
+
+    def pop_first_sample(self) -> Any:
+        """Return the probe payload once; None if it was already consumed."""
+        sample, self._first_sample = self._first_sample, None
+        return sample
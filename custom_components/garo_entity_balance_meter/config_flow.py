@@ -1,17 +1,25 @@
 from __future__ import annotations
-import logging, asyncio, aiohttp, voluptuous as vol
+import logging, voluptuous as vol
 from typing import Any
 from homeassistant import config_entries
 from homeassistant.core import callback, HomeAssistant
 from homeassistant.data_entry_flow import FlowResult
+from homeassistant.helpers.aiohttp_client import async_get_clientsession
 
 from .const import (
     DOMAIN,
     CONF_HOST, CONF_USERNAME, CONF_PASSWORD,
     CONF_SCAN_INTERVAL, CONF_SLOW_SCAN_INTERVAL,
-    CONF_IGNORE_TLS_ERRORS, CONF_USE_HTTP,
-    DEFAULT_SCAN_INTERVAL, DEFAULT_SLOW_SCAN_INTERVAL, API_PATH,
+    CONF_IGNORE_TLS_ERRORS, CONF_USE_HTTP, CONF_PUSH_MODE, CONF_ADAPTIVE_POLLING,
+    CONF_HUB, CONF_DEVICES, CONF_ADD_ANOTHER,
+    DEFAULT_SCAN_INTERVAL, DEFAULT_SLOW_SCAN_INTERVAL,
+    CONF_STATS_INTERVAL, DEFAULT_STATS_INTERVAL,
+    CONF_DEADBAND_POWER, CONF_DEADBAND_CURRENT, CONF_DEADBAND_VOLTAGE, CONF_MAX_STATE_AGE,
+    DEFAULT_DEADBAND_POWER, DEFAULT_DEADBAND_CURRENT, DEFAULT_DEADBAND_VOLTAGE, DEFAULT_MAX_STATE_AGE,
+    CONF_FUSE_SIZE, CONF_THRESHOLD_HEADROOM, CONF_THRESHOLD_IMBALANCE, CONF_THRESHOLD_TIME_TO_TRIP,
+    DEFAULT_FUSE_SIZE, DEFAULT_THRESHOLD_HEADROOM, DEFAULT_THRESHOLD_IMBALANCE, DEFAULT_THRESHOLD_TIME_TO_TRIP,
 )
+from .client import GaroClient, GaroAuthError
 
 _LOGGER = logging.getLogger(__name__)
 
@@ -20,34 +28,28 @@ class InvalidAuth(Exception): pass
 
 
 async def _async_validate_input(hass: HomeAssistant, data: dict[str, Any]) -> None:
-    host = data[CONF_HOST]
-    username = data[CONF_USERNAME]
-    password = data[CONF_PASSWORD]
-    ignore_tls = data.get(CONF_IGNORE_TLS_ERRORS, True)
-    use_http = data.get(CONF_USE_HTTP, False)
-    scheme = "http" if use_http else "https"
-    session = aiohttp.ClientSession(connector=aiohttp.TCPConnector(ssl=not ignore_tls))
+    # One request: Home Assistant's shared session instead of a pool of our own
+    verify_ssl = not data.get(CONF_IGNORE_TLS_ERRORS, True)
+    client = GaroClient(
+        data[CONF_HOST], data[CONF_USERNAME], data[CONF_PASSWORD],
+        use_http=data.get(CONF_USE_HTTP, False), verify_ssl=verify_ssl,
+        session=async_get_clientsession(hass, verify_ssl=verify_ssl),
+    )
     try:
-        async with asyncio.timeout(10):
-            async with session.get(
-                f"{scheme}://{host}{API_PATH}",
-                auth=aiohttp.BasicAuth(username, password),
-            ) as resp:
-                if resp.status in (401, 403):
-                    raise InvalidAuth
-                if resp.status >= 400:
-                    raise CannotConnect(f"HTTP {resp.status}")
-    except InvalidAuth:
-        raise
+        await client.async_get_meter()
+    except GaroAuthError as err:
+        raise InvalidAuth from err
     except Exception as err:
         raise CannotConnect(err) from err
-    finally:
-        await session.close()
 
 
 class GaroBalanceMeterConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):
     VERSION = 1
 
+    def __init__(self) -> None:
+        self._hub_data: dict[str, Any] = {}
+        self._hub_units: list[dict[str, Any]] = []
+
     @staticmethod
     @callback
     def async_get_options_flow(config_entry: config_entries.ConfigEntry):
@@ -62,7 +64,8 @@ class GaroBalanceMeterConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):
                 errors[CONF_SLOW_SCAN_INTERVAL] = "slow_must_be_gte_fast"
             else:
                 try:
-                    await self.async_set_unique_id(user_input[CONF_HOST])
+                    unique_id = user_input[CONF_HOST]
+                    await self.async_set_unique_id(f"hub_{unique_id}" if user_input.get(CONF_HUB) else unique_id)
                     self._abort_if_unique_id_configured()
                     await _async_validate_input(self.hass, user_input)
                 except InvalidAuth:
@@ -73,6 +76,13 @@ class GaroBalanceMeterConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):
                     _LOGGER.exception("Unexpected error validating input")
                     errors["base"] = "unknown"
                 else:
+                    if user_input.get(CONF_HUB):
+                        self._hub_data = {
+                            k: v for k, v in user_input.items()
+                            if k not in (CONF_HOST, CONF_USERNAME, CONF_PASSWORD)
+                        }
+                        self._hub_units = [{k: user_input[k] for k in (CONF_HOST, CONF_USERNAME, CONF_PASSWORD)}]
+                        return await self.async_step_hub_unit()
                     return self.async_create_entry(
                         title=f"GARO Balance @ {user_input[CONF_HOST]}",
                         data=user_input,
@@ -86,9 +96,54 @@ class GaroBalanceMeterConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):
             vol.Optional(CONF_SLOW_SCAN_INTERVAL, default=DEFAULT_SLOW_SCAN_INTERVAL): vol.All(int, vol.Range(min=5)),
             vol.Optional(CONF_IGNORE_TLS_ERRORS, default=True): bool,
             vol.Optional(CONF_USE_HTTP, default=False): bool,
+            vol.Optional(CONF_PUSH_MODE, default=False): bool,
+            vol.Optional(CONF_ADAPTIVE_POLLING, default=False): bool,
+            vol.Optional(CONF_HUB, default=False): bool,
         })
         return self.async_show_form(step_id="user", data_schema=schema, errors=errors)
 
+    async def async_step_hub_unit(self, user_input: dict[str, Any] | None = None) -> FlowResult:
+        """Add further units to a hub entry; the first unit's settings apply to all."""
+        errors = {}
+        if user_input is not None and user_input.get(CONF_HOST):
+            unit = {k: user_input[k] for k in (CONF_HOST, CONF_USERNAME, CONF_PASSWORD)}
+            if any(u[CONF_HOST] == unit[CONF_HOST] for u in self._hub_units):
+                errors[CONF_HOST] = "already_in_hub"
+            else:
+                try:
+                    await _async_validate_input(self.hass, {**self._hub_data, **unit})
+                except InvalidAuth:
+                    errors["base"] = "invalid_auth"
+                except CannotConnect:
+                    errors["base"] = "cannot_connect"
+                except Exception:
+                    _LOGGER.exception("Unexpected error validating input")
+                    errors["base"] = "unknown"
+                else:
+                    self._hub_units.append(unit)
+                    if not user_input.get(CONF_ADD_ANOTHER):
+                        return self._async_create_hub_entry()
+        elif user_input is not None:
+            return self._async_create_hub_entry()
+
+        schema = vol.Schema({
+            vol.Optional(CONF_HOST, default=(user_input or {}).get(CONF_HOST, "")): str,
+            vol.Optional(CONF_USERNAME, default=(user_input or {}).get(CONF_USERNAME, "")): str,
+            vol.Optional(CONF_PASSWORD, default=(user_input or {}).get(CONF_PASSWORD, "")): str,
+            vol.Optional(CONF_ADD_ANOTHER, default=False): bool,
+        })
+        return self.async_show_form(
+            step_id="hub_unit", data_schema=schema, errors=errors,
+            description_placeholders={"count": str(len(self._hub_units))},
+        )
+
+    @callback
+    def _async_create_hub_entry(self) -> FlowResult:
+        return self.async_create_entry(
+            title=f"GARO Balance hub ({len(self._hub_units)} units)",
+            data={**self._hub_data, CONF_DEVICES: self._hub_units},
+        )
+
 
 class GaroBalanceMeterOptionsFlow(config_entries.OptionsFlow):
     def __init__(self, entry: config_entries.ConfigEntry) -> None:
@@ -117,5 +172,16 @@ class GaroBalanceMeterOptionsFlow(config_entries.OptionsFlow):
             vol.Optional(CONF_SLOW_SCAN_INTERVAL, default=data.get(CONF_SLOW_SCAN_INTERVAL, DEFAULT_SLOW_SCAN_INTERVAL)): vol.All(int, vol.Range(min=5)),
             vol.Optional(CONF_IGNORE_TLS_ERRORS, default=data.get(CONF_IGNORE_TLS_ERRORS, True)): bool,
             vol.Optional(CONF_USE_HTTP, default=data.get(CONF_USE_HTTP, False)): bool,
+            vol.Optional(CONF_PUSH_MODE, default=data.get(CONF_PUSH_MODE, False)): bool,
+            vol.Optional(CONF_ADAPTIVE_POLLING, default=data.get(CONF_ADAPTIVE_POLLING, False)): bool,
+            vol.Optional(CONF_STATS_INTERVAL, default=data.get(CONF_STATS_INTERVAL, DEFAULT_STATS_INTERVAL)): vol.All(int, vol.Range(min=10)),
+            vol.Optional(CONF_DEADBAND_POWER, default=data.get(CONF_DEADBAND_POWER, DEFAULT_DEADBAND_POWER)): vol.All(vol.Coerce(float), vol.Range(min=0, max=50)),
+            vol.Optional(CONF_DEADBAND_CURRENT, default=data.get(CONF_DEADBAND_CURRENT, DEFAULT_DEADBAND_CURRENT)): vol.All(vol.Coerce(float), vol.Range(min=0)),
+            vol.Optional(CONF_DEADBAND_VOLTAGE, default=data.get(CONF_DEADBAND_VOLTAGE, DEFAULT_DEADBAND_VOLTAGE)): vol.All(vol.Coerce(float), vol.Range(min=0)),
+            vol.Optional(CONF_MAX_STATE_AGE, default=data.get(CONF_MAX_STATE_AGE, DEFAULT_MAX_STATE_AGE)): vol.All(int, vol.Range(min=10)),
+            vol.Optional(CONF_FUSE_SIZE, default=data.get(CONF_FUSE_SIZE, DEFAULT_FUSE_SIZE)): vol.All(vol.Coerce(float), vol.Range(min=0)),
+            vol.Optional(CONF_THRESHOLD_HEADROOM, default=data.get(CONF_THRESHOLD_HEADROOM, DEFAULT_THRESHOLD_HEADROOM)): vol.All(vol.Coerce(float), vol.Range(min=0)),
+            vol.Optional(CONF_THRESHOLD_IMBALANCE, default=data.get(CONF_THRESHOLD_IMBALANCE, DEFAULT_THRESHOLD_IMBALANCE)): vol.All(vol.Coerce(float), vol.Range(min=0)),
+            vol.Optional(CONF_THRESHOLD_TIME_TO_TRIP, default=data.get(CONF_THRESHOLD_TIME_TO_TRIP, DEFAULT_THRESHOLD_TIME_TO_TRIP)): vol.All(int, vol.Range(min=0)),
         })
         return self.async_show_form(step_id="init", data_schema=schema, errors=errors)
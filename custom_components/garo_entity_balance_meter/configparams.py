@@ -0,0 +1,73 @@
+"""Snapshot of /config/config-parameter, indexed by group and parameter."""
+from __future__ import annotations
+import logging, asyncio
+from typing import Any
+
+from .client import GaroClient, GaroError
+from .const import DEFAULT_FETCH_CONCURRENCY
+from .endpoints import decode_scalar
+
+_LOGGER = logging.getLogger(__name__)
+
+# Parameters never read into the snapshot, so they cannot end up in states or events
+SECRET_MARKERS = ("password", "passwd", "secret", "token", "private", "psk")
+
+ConfigIndex = dict[str, dict[str, str]]
+
+
+def _is_secret(name: str) -> bool:
+    lowered = name.lower()
+    return any(marker in lowered for marker in SECRET_MARKERS)
+
+
+def diff_snapshots(old: ConfigIndex, new: ConfigIndex) -> dict[tuple[str, str], tuple[str | None, str | None]]:
+    """``(group, parameter) -> (old, new)`` for every added, removed or changed value."""
+    changes = {}
+    for group in old.keys() | new.keys():
+        before, after = old.get(group, {}), new.get(group, {})
+        for parameter in before.keys() | after.keys():
+            if before.get(parameter) != after.get(parameter):
+                changes[(group, parameter)] = (before.get(parameter), after.get(parameter))
+    return changes
+
+
+async def async_load_snapshot(
+    client: GaroClient, previous: ConfigIndex | None = None, *, limit: int = DEFAULT_FETCH_CONCURRENCY,
+) -> ConfigIndex:
+    """Read every group's parameters and index the values.
+
+    The device lists the groups, then each group's parameter names, then
+    answers one value per request: 1 + groups + groups x parameters calls,
+    ``limit`` at a time. A group that answers with its values directly
+    takes one call. The group listing fails the whole load; a group that
+    fails keeps its values from ``previous``.
+    """
+    previous = previous or {}
+    semaphore = asyncio.Semaphore(limit)
+    groups = await client.async_get_config_parameter()
+    if isinstance(groups, dict):
+        groups = list(groups)
+    if not isinstance(groups, list):
+        raise GaroError(f"Unexpected config group listing: {groups!r}"[:160])
+
+    async def read(group: str, parameter: str | None = None) -> Any:
+        async with semaphore:
+            return await client.async_get_config_parameter(group, parameter)
+
+    async def load_group(group: str) -> dict[str, str]:
+        try:
+            payload = await read(group)
+            if isinstance(payload, list):
+                names = [str(name) for name in payload if not _is_secret(str(name))]
+                values = await asyncio.gather(*(read(group, name) for name in names))
+                payload = {name: decode_scalar(value) for name, value in zip(names, values)}
+        except GaroError as err:
+            _LOGGER.debug("Config group %s failed, keeping previous values: %s", group, err)
+            return previous.get(group, {})
+        if not isinstance(payload, dict):
+            return previous.get(group, {})
+        return {str(k): str(v) for k, v in payload.items() if v is not None and not _is_secret(str(k))}
+
+    names = [str(group) for group in groups]
+    loaded = await asyncio.gather(*(load_group(group) for group in names))
+    return {group: values for group, values in zip(names, loaded) if values}
@@ -10,8 +10,127 @@ CONF_SCAN_INTERVAL = "scan_interval"
 CONF_SLOW_SCAN_INTERVAL = "slow_scan_interval"
 CONF_IGNORE_TLS_ERRORS = "ignore_tls_errors"
 CONF_USE_HTTP = "use_http"
+CONF_PUSH_MODE = "push_mode"
+CONF_ADAPTIVE_POLLING = "adaptive_polling"
+CONF_STATS_INTERVAL = "stats_interval"
+CONF_HUB = "hub"
+CONF_DEVICES = "devices"
+CONF_ADD_ANOTHER = "add_another"
+CONF_DEADBAND_POWER = "deadband_power"
+CONF_DEADBAND_CURRENT = "deadband_current"
+CONF_DEADBAND_VOLTAGE = "deadband_voltage"
+CONF_MAX_STATE_AGE = "max_state_age"
+CONF_FUSE_SIZE = "fuse_size"
+CONF_THRESHOLD_HEADROOM = "threshold_headroom"
+CONF_THRESHOLD_IMBALANCE = "threshold_imbalance"
+CONF_THRESHOLD_TIME_TO_TRIP = "threshold_time_to_trip"
 
 DEFAULT_SCAN_INTERVAL = 15
 DEFAULT_SLOW_SCAN_INTERVAL = 300
+DEFAULT_STATS_INTERVAL = 60
+
+# Write throttling: a meter sensor only writes a new state when it moves past
+# its deadband, or when its last written state is older than the max age.
+# 0 disables the deadband for that group.
+DEFAULT_DEADBAND_POWER = 1.0     # % of the last written value
+DEFAULT_DEADBAND_CURRENT = 0.1   # A
+DEFAULT_DEADBAND_VOLTAGE = 1.0   # V
+DEFAULT_MAX_STATE_AGE = 300      # s
+
+# Phase sensors (headroom, imbalance, time to trip) write a new state only
+# when the value crosses into another band of this width. A fuse size of 0 leaves the
+# headroom and time-to-trip sensors unknown.
+DEFAULT_FUSE_SIZE = 0.0              # A, main fuse rating
+DEFAULT_THRESHOLD_HEADROOM = 1.0     # A
+DEFAULT_THRESHOLD_IMBALANCE = 5.0    # %
+DEFAULT_THRESHOLD_TIME_TO_TRIP = 60  # s
 
 API_PATH = "/status/energy-meter"
+API_PATH_TEMPS = "/status/temperatures"
+API_PATH_OCMF_XML = "/status/energy-meter-ocmf-xml"
+API_PATH_PUB_KEY = "/status/energy-meter-pub-key"
+API_PATH_FIRMWARE_VERSION = "/config/firmware-version"
+API_PATH_DEVICE_ID = "/config/device-id"
+API_PATH_UNIT_ID = "/config/unit-id"
+API_PATH_CONFIG_PARAMETER = "/config/config-parameter"
+API_PATH_FACTORY_CONFIG_PARAMETER = "/factory/config-parameter"
+API_PATH_NETWORK_INTERFACE = "/netconf/network-interface"
+API_PATH_CONNECTION_STATUS = "/netconf/connection-status"
+API_PATH_CSMS_STATUS = "/netconf/csms-connection-status"
+API_PATH_WIFI_NETWORKS = "/netconf/wifi-available-networks"
+API_PATH_HAL_BUTTON = "/hal/button"
+API_PATH_HAL_ADC = "/hal/adc"
+API_PATH_HAL_GPIO = "/hal/gpio"
+API_PATH_HAL_OUTPUT = "/hal/output"
+
+# HTTP client: per-request timeouts (s) and a small keep-alive pool per device,
+# sized by CLIENT_CONNECTION_LIMIT further down.
+REQUEST_TIMEOUT = 10
+METER_REQUEST_TIMEOUT = 15
+CLIENT_KEEPALIVE_TIMEOUT = 30
+
+# Circuit breaker per unit: opens after BREAKER_FAILURE_THRESHOLD meter or
+# connect failures in a row. While open, only BREAKER_PROBE_PATH is tried, after a
+# jittered backoff that doubles per failed probe between these bounds (s).
+BREAKER_FAILURE_THRESHOLD = 3
+BREAKER_BACKOFF_MIN = 15
+BREAKER_BACKOFF_MAX = 600
+BREAKER_PROBE_PATH = API_PATH_FIRMWARE_VERSION
+
+# Slow diagnostics batch: max requests in flight per device, and one overall deadline
+DEFAULT_FETCH_CONCURRENCY = 3
+DEFAULT_FETCH_DEADLINE = 20
+# Room for everything a device can have in flight at once, so the meter poll
+# never waits for a connection: the diagnostics batch and the config snapshot
+# (DEFAULT_FETCH_CONCURRENCY each), one OCMF request, the push-mode stream and the meter
+CLIENT_CONNECTION_LIMIT = 2 * DEFAULT_FETCH_CONCURRENCY + 3
+
+# Consecutive failures stretch a coordinator's interval up to this multiple of its base
+BACKOFF_MAX_FACTOR = 8
+
+# Push mode: fall back to polling after this many seconds without a meter event,
+# and reconnect the event stream with exponential backoff between these bounds
+STREAM_STALL_TIMEOUT = 60
+STREAM_BACKOFF_MIN = 5
+STREAM_BACKOFF_MAX = 300
+
+# Identity cache (firmware, device ID, unit ID) kept in .storage per config entry
+IDENTITY_STORAGE_VERSION = 1
+IDENTITY_REVALIDATE_INTERVAL = 24 * 3600
+
+# Energy register integrity: the last good reading is kept in .storage. An
+# increase must fit ENERGY_MAX_POWER over the elapsed time and the power
+# integral (plus tolerance); a jump or drop is only accepted as a reset after
+# ENERGY_CONFIRM_SAMPLES consistent readings.
+ENERGY_STORAGE_VERSION = 1
+ENERGY_MAX_POWER = 50000         # W
+ENERGY_POWER_TOLERANCE = 0.5     # register may run 50 % ahead of the sampled power integral
+ENERGY_MARGIN = 50               # Wh, register resolution and sampling slack
+ENERGY_CONFIRM_SAMPLES = 3
+ENERGY_CONFIDENCE_ALPHA = 0.1
+
+# Adaptive meter polling: interval drops to the minimum on a load jump and
+# grows by ADAPTIVE_GROWTH per stable sample up to ADAPTIVE_MAX_FACTOR x the
+# configured interval. The floor rises with device latency and error rate.
+ADAPTIVE_MIN_INTERVAL = 5
+ADAPTIVE_MAX_FACTOR = 4
+ADAPTIVE_GROWTH = 1.5
+ADAPTIVE_POWER_DELTA = 200       # W
+ADAPTIVE_POWER_RATIO = 0.2       # of previous power
+ADAPTIVE_CURRENT_DELTA = 2.0     # A on any phase
+ADAPTIVE_LATENCY_FACTOR = 5      # never poll faster than 5x the answer time
+ADAPTIVE_ERROR_PENALTY = 3       # floor multiplier at a 100 % error rate is 1 + 3
+ADAPTIVE_EWMA_ALPHA = 0.2
+
+# Fired for every changed /config/config-parameter value after the first snapshot
+EVENT_CONFIG_CHANGED = f"{DOMAIN}_config_changed"
+# A snapshot costs 1 + groups + groups x parameters requests, so it runs at
+# startup and then only this often, and only while a config sensor is
+# enabled or something listens for EVENT_CONFIG_CHANGED (s)
+CONFIG_SNAPSHOT_INTERVAL = 3600
+
+# Meter error rate sensor: share of failed polls among the last N
+METRICS_ERROR_WINDOW = 20
+
+# Hub mode: requests in flight across all units of one hub entry
+HUB_MAX_CONCURRENT_REQUESTS = 4
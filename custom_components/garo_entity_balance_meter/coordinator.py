@@ -0,0 +1,415 @@
+"""Data update coordinators for the fast meter and slow diagnostics cadences."""
+from __future__ import annotations
+import logging, time
+from collections import deque
+from datetime import timedelta
+from typing import Any
+
+from homeassistant.core import CALLBACK_TYPE, HomeAssistant, callback
+from homeassistant.helpers import device_registry as dr
+from homeassistant.helpers.event import async_call_later
+from homeassistant.helpers.update_coordinator import DataUpdateCoordinator, UpdateFailed
+
+from .const import (
+    DOMAIN, BACKOFF_MAX_FACTOR, ADAPTIVE_MIN_INTERVAL, DEFAULT_STATS_INTERVAL, METRICS_ERROR_WINDOW, API_PATH_FIRMWARE_VERSION,
+    EVENT_CONFIG_CHANGED, CONFIG_SNAPSHOT_INTERVAL, API_PATH_OCMF_XML, API_PATH_PUB_KEY,
+)
+from .adaptive import AdaptiveInterval
+from .client import GaroClient, GaroError, decode_payload
+from .fetch import FetchEngine
+from .endpoints import (
+    CADENCE_DIAGNOSTICS, CADENCE_IDENTITY, ENDPOINT_BY_KEY, apply_endpoints, decode_scalar, endpoint_paths,
+)
+from .parser import parse_meter_payload
+from .stats import MeterStats
+from .phases import PhaseEngine
+from .metrics import LatencyHistogram
+from .configparams import ConfigIndex, async_load_snapshot, diff_snapshots
+from .identity import GaroIdentityCache
+from .energy import GaroEnergyGuard
+from .ocmf import (
+    OcmfError, OcmfReading, parse_ocmf_xml, verify_signature,
+    STATUS_VERIFIED, STATUS_INVALID, STATUS_NO_KEY, STATUS_NO_READING, STATUS_MALFORMED,
+)
+
+_LOGGER = logging.getLogger(__name__)
+
+class GaroCoordinator(DataUpdateCoordinator[dict[str, Any]]):
+    """Coordinator with its own interval, exponential backoff, failure count and tick timings."""
+
+    def __init__(self, hass: HomeAssistant, name: str, interval: int) -> None:
+        # always_update=False: listeners are only called when the payload differs
+        super().__init__(
+            hass, _LOGGER, name=f"{DOMAIN} {name}",
+            update_interval=timedelta(seconds=interval), always_update=False,
+        )
+        self.base_interval = timedelta(seconds=interval)
+        self.consecutive_failures = 0
+        self.total_failures = 0
+        self.tick_latency = LatencyHistogram()
+        self.last_tick: float | None = None
+        self._outcomes: deque[bool] = deque(maxlen=METRICS_ERROR_WINDOW)
+        self.first_refresh_delay = timedelta(0)     # set by GaroHub.stagger_first_refresh
+        self._unsub_first_refresh: CALLBACK_TYPE | None = None
+
+    @property
+    def error_rate(self) -> float | None:
+        """Failed share of the recent ticks, in percent."""
+        if not self._outcomes:
+            return None
+        return round(100 * self._outcomes.count(False) / len(self._outcomes), 1)
+
+    async def _async_update_data(self) -> dict[str, Any]:
+        start = time.monotonic()
+        try:
+            data = await self._async_fetch()
+        except UpdateFailed:
+            self._record_tick(start, False)
+            self.consecutive_failures += 1
+            self.total_failures += 1
+            if self.update_interval is not None:
+                self.update_interval = self._nominal_interval() * min(2 ** self.consecutive_failures, BACKOFF_MAX_FACTOR)
+            raise
+        self._record_tick(start, True)
+        if self.consecutive_failures:
+            _LOGGER.info("%s recovered after %d failures", self.name, self.consecutive_failures)
+            self.consecutive_failures = 0
+        # None means a push source paused polling; leave it alone
+        if self.update_interval is not None:
+            self.update_interval = self._next_interval(data)
+        return data
+
+    def _record_tick(self, start: float, ok: bool) -> None:
+        self.last_tick = time.monotonic() - start
+        self.tick_latency.record(self.last_tick)
+        self._outcomes.append(ok)
+
+    def _nominal_interval(self) -> timedelta:
+        return self.base_interval
+
+    @callback
+    def async_delay_next_refresh(self, offset: timedelta) -> None:
+        """Shift the next scheduled poll by ``offset``; later polls use the normal interval."""
+        if self.update_interval is not None:
+            self.update_interval = self._nominal_interval() + offset
+
+    @callback
+    def async_refresh_later(self) -> None:
+        """Refresh once in the background after ``first_refresh_delay``.
+
+        The refresh schedules the next one a full interval later, so the
+        offset carries over to every later cycle.
+        """
+        if self._unsub_first_refresh is None:
+            self._unsub_first_refresh = async_call_later(self.hass, self.first_refresh_delay, self._async_first_refresh)
+
+    async def _async_first_refresh(self, _now) -> None:
+        await self.async_refresh()
+
+    async def async_shutdown(self) -> None:
+        if self._unsub_first_refresh is not None:
+            self._unsub_first_refresh()
+        await super().async_shutdown()
+
+    def _next_interval(self, data: dict[str, Any]) -> timedelta:
+        return self.base_interval
+
+    async def _async_fetch(self) -> dict[str, Any]:
+        raise NotImplementedError
+
+
+class GaroMeterCoordinator(GaroCoordinator):
+    """Polls /status/energy-meter on the fast interval."""
+
+    def __init__(
+        self, hass, client: GaroClient, interval: int, energy: GaroEnergyGuard, *,
+        adaptive: bool = False, push: bool = False, fuse: float | None = None,
+        stats_interval: int = DEFAULT_STATS_INTERVAL,
+    ) -> None:
+        super().__init__(hass, "meter", interval)
+        self._client = client
+        self.energy = energy
+        self._adaptive = AdaptiveInterval(interval) if adaptive else None
+        self._latency = 0.0
+        self.parse_latency = LatencyHistogram()
+        # Push mode can deliver samples faster than any poll interval
+        min_interval = 1 if push else min(interval, ADAPTIVE_MIN_INTERVAL)
+        self.stats = MeterStats(min_interval)
+        # Room for every sample between two evaluations by GaroStatsCoordinator
+        self.phases = PhaseEngine(fuse, int(stats_interval / min_interval) + 2)
+
+    def _add_sample(self, values: dict[str, Any]) -> None:
+        """Feed a parsed sample to the rolling stats and the phase engine; both are read by GaroStatsCoordinator."""
+        now = time.monotonic()
+        self.stats.add(now, values)
+        self.phases.add(now, values)
+
+    async def _async_update_data(self) -> dict[str, Any]:
+        data = await super()._async_update_data()
+        self._add_sample(data)
+        data["poll_interval"] = self.update_interval.total_seconds() if self.update_interval else None
+        return data
+
+    async def _async_fetch(self) -> dict[str, Any]:
+        start = time.monotonic()
+        try:
+            payload = await self._client.async_get_meter()
+        except GaroError as err:
+            if self._adaptive:
+                self._adaptive.observe_error()
+            raise UpdateFailed(f"Energy meter fetch failed: {err}") from err
+        parsed = time.monotonic()
+        self._latency = parsed - start
+        values = parse_meter_payload(payload)
+        self.parse_latency.record(time.monotonic() - parsed)
+        return self.energy.async_check(values)
+
+    def _nominal_interval(self) -> timedelta:
+        if self._adaptive:
+            return timedelta(seconds=self._adaptive.interval)
+        return self.base_interval
+
+    def _next_interval(self, data: dict[str, Any]) -> timedelta:
+        if self._adaptive:
+            return timedelta(seconds=self._adaptive.observe(data, self._latency))
+        return self.base_interval
+
+    @callback
+    def async_seed(self, payload: Any) -> None:
+        """Publish an already fetched payload (the startup probe) as the first refresh."""
+        values = self.energy.async_check(parse_meter_payload(payload))
+        self._add_sample(values)
+        self.async_set_updated_data({**values, "poll_interval": self.base_interval.total_seconds()})
+
+    @callback
+    def async_push(self, values: dict[str, Any]) -> None:
+        """Publish meter values that arrived outside a poll (push mode)."""
+        values = self.energy.async_check(values)
+        self._add_sample(values)
+        self.async_set_updated_data({**(self.data or {}), **values, "poll_interval": None})
+
+    @callback
+    def async_pause_polling(self) -> None:
+        """Stop scheduling polls while a push source keeps the data fresh."""
+        if self.update_interval is not None:
+            _LOGGER.debug("%s polling paused", self.name)
+        self.update_interval = None
+
+    @callback
+    def async_resume_polling(self) -> None:
+        """Fall back to polling, e.g. when the push source stalls."""
+        if self.update_interval is None:
+            _LOGGER.info("%s falling back to polling", self.name)
+            self.update_interval = self._nominal_interval()
+            self.hass.async_create_task(self.async_request_refresh())
+
+
+class GaroStatsCoordinator(GaroCoordinator):
+    """Publishes the meter's rolling statistics, phase values and tick health at a lower rate than the samples arrive.
+
+    The phase engine is evaluated here, in one batch over the samples the
+    meter added since the previous refresh.
+    """
+
+    def __init__(self, hass, meter: GaroMeterCoordinator, interval: int) -> None:
+        super().__init__(hass, "stats", interval)
+        self._meter = meter
+
+    async def _async_fetch(self) -> dict[str, Any]:
+        meter = self._meter
+        return {
+            **meter.stats.snapshot(time.monotonic()),
+            **meter.phases.evaluate(),
+            # Published here rather than by the meter so they stay available while polls fail
+            "tick_duration": round(meter.last_tick * 1000, 1) if meter.last_tick is not None else None,
+            "error_rate": meter.error_rate,
+        }
+
+
+class GaroDiagnosticsCoordinator(GaroCoordinator):
+    """Fetches the slow endpoints of ``endpoints.ENDPOINTS`` as one concurrent batch.
+
+    Entities listen with their sensor key as context, so only endpoints
+    feeding an enabled sensor are fetched, plus the identity endpoints when
+    the identity cache needs them.
+    """
+
+    def __init__(
+        self, hass, engine: FetchEngine, interval: int,
+        identity: GaroIdentityCache, device_identifier: tuple[str, str],
+    ) -> None:
+        super().__init__(hass, "diagnostics", interval)
+        self._engine = engine
+        self._identity = identity
+        self._device_identifier = device_identifier
+        self._cache: dict[str, Any] = dict(identity.values)
+        self._fetched: set[str] = set()
+
+    @callback
+    def async_add_listener(self, update_callback, context: Any = None):
+        remove = super().async_add_listener(update_callback, context)
+        endpoint = ENDPOINT_BY_KEY.get(context)
+        if endpoint is not None and endpoint.path not in self._fetched and self.data is not None:
+            # Sensor enabled after the last batch skipped its endpoint
+            self.hass.async_create_task(self.async_request_refresh())
+        return remove
+
+    async def _async_fetch(self) -> dict[str, Any]:
+        revalidate = self._identity.stale
+        paths = endpoint_paths(CADENCE_DIAGNOSTICS, self.async_contexts())
+        if revalidate:
+            paths += endpoint_paths(CADENCE_IDENTITY)
+        results = await self._engine.async_fetch(paths, self._identity.validators)
+        if not any(res.ok or res.not_modified for res in results.values()):
+            raise UpdateFailed("All diagnostic endpoints failed")
+
+        firmware = results[API_PATH_FIRMWARE_VERSION]
+        if not revalidate and firmware.ok and str(decode_scalar(firmware.payload)) != self._identity.values.get("firmware_version"):
+            _LOGGER.debug("Firmware version changed, revalidating identity")
+            results.update(await self._engine.async_fetch(endpoint_paths(CADENCE_IDENTITY)))
+            revalidate = True
+
+        self._fetched.update(paths)
+        apply_endpoints(results, self._cache)
+        if self._identity.async_update(results, self._cache, revalidate):
+            self._async_update_device()
+        return dict(self._cache)
+
+    @callback
+    def _async_update_device(self) -> None:
+        device_registry = dr.async_get(self.hass)
+        device = device_registry.async_get_device(identifiers={self._device_identifier})
+        if device is None:
+            return
+        device_registry.async_update_device(
+            device.id,
+            merge_connections=self._identity.connections,
+            serial_number=self._identity.values.get("device_id"),
+            sw_version=self._identity.values.get("firmware_version"),
+        )
+
+
+class GaroConfigCoordinator(GaroCoordinator):
+    """Reads the config-parameter snapshot and publishes only what changed.
+
+    The first snapshot is always read so the parameters can be discovered.
+    Later ones, every CONFIG_SNAPSHOT_INTERVAL, are skipped unless a config
+    sensor is enabled or an automation listens for EVENT_CONFIG_CHANGED.
+    ``changes`` holds the diff of the last refresh; every change after the
+    first snapshot is also fired as an EVENT_CONFIG_CHANGED event.
+    """
+
+    def __init__(self, hass, client: GaroClient, interval: int = CONFIG_SNAPSHOT_INTERVAL) -> None:
+        super().__init__(hass, "config", interval)
+        self._client = client
+        self.changes: dict[tuple[str, str], tuple[str | None, str | None]] = {}
+
+    def _in_use(self) -> bool:
+        # Config sensors register with their (group, parameter) as context
+        return any(True for _ in self.async_contexts()) or EVENT_CONFIG_CHANGED in self.hass.bus.async_listeners()
+
+    async def _async_fetch(self) -> ConfigIndex:
+        if self.data is not None and not self._in_use():
+            self.changes = {}
+            return self.data
+        previous = self.data or {}
+        try:
+            snapshot = await async_load_snapshot(self._client, previous)
+        except GaroError as err:
+            raise UpdateFailed(f"Config parameter snapshot failed: {err}") from err
+        self.changes = diff_snapshots(previous, snapshot)
+        if self.data is not None:
+            for (group, parameter), (old, new) in self.changes.items():
+                _LOGGER.info("%s config %s.%s changed: %r -> %r", self._client.host, group, parameter, old, new)
+                self.hass.bus.async_fire(EVENT_CONFIG_CHANGED, {
+                    "host": self._client.host, "group": group, "parameter": parameter,
+                    "old_value": old, "new_value": new,
+                })
+        return snapshot
+
+
+class GaroOcmfCoordinator(GaroCoordinator):
+    """Fetches the signed OCMF reading on the slow cadence and verifies it off the event loop.
+
+    The public key is fetched once and kept. A body identical to the last
+    verified one is not parsed or verified again, and listeners are not
+    called; a body that could not be checked (no key yet) is tried again.
+    ``ocmf_energy`` only ever holds a reading whose signature checked out.
+    """
+
+    def __init__(self, hass, client: GaroClient, interval: int) -> None:
+        super().__init__(hass, "ocmf", interval)
+        self._client = client
+        self._body: bytes | None = None
+        self._public_key: str | None = None
+        self.verify_latency = LatencyHistogram()
+
+    @callback
+    def async_add_listener(self, update_callback, context: Any = None):
+        remove = super().async_add_listener(update_callback, context)
+        if self.data is None:
+            # Both sensors are disabled by default; nothing is fetched until one is enabled
+            self.async_refresh_later()
+        return remove
+
+    async def _async_get_body(self, path: str) -> bytes | None:
+        """Body of ``path``; None when the device answers 502 (no OCMF or key available)."""
+        try:
+            status, _, body = await self._client.async_request(path)
+        except GaroError as err:
+            raise UpdateFailed(f"OCMF fetch failed: {err}") from err
+        if status == 502:
+            return None
+        if status != 200:
+            raise UpdateFailed(f"Status {status} from {path}")
+        return body
+
+    async def _async_public_key(self) -> str | None:
+        if self._public_key is None:
+            body = await self._async_get_body(API_PATH_PUB_KEY)
+            if body:
+                # text/plain from the device; decode_payload also unwraps a JSON string
+                self._public_key = str(decode_payload(body)).strip() or None
+        return self._public_key
+
+    async def _async_verify(self, reading: OcmfReading, key: str) -> bool:
+        start = time.monotonic()
+        try:
+            return await self.hass.async_add_executor_job(verify_signature, reading, key)
+        finally:
+            self.verify_latency.record(time.monotonic() - start)
+
+    async def _async_fetch(self) -> dict[str, Any]:
+        body = await self._async_get_body(API_PATH_OCMF_XML)
+        if self.data is not None and body == self._body:
+            return self.data
+        return await self._async_check(body)
+
+    async def _async_check(self, body: bytes | None) -> dict[str, Any]:
+        """Status for ``body``; the body is only remembered once its signature check ran."""
+        previous = self.data or {"ocmf_energy": None, "ocmf_time": None}
+        text = body.decode("utf-8", "replace").strip() if body else ""
+        if not text:
+            return {**previous, "ocmf_status": STATUS_NO_READING}
+        try:
+            reading = parse_ocmf_xml(text)
+            # Only the key endpoint counts; a key embedded in the XML would vouch for its own reading
+            key = await self._async_public_key()
+            if key is None:
+                return {**previous, "ocmf_status": STATUS_NO_KEY}
+            valid = await self._async_verify(reading, key)
+            if not valid and key == self._public_key:
+                # The meter may have been replaced; check against a freshly read key once
+                self._public_key = None
+                fresh = await self._async_public_key()
+                if fresh is not None and fresh != key:
+                    valid = await self._async_verify(reading, fresh)
+        except OcmfError as err:
+            _LOGGER.debug("%s OCMF payload not usable: %s", self._client.host, err)
+            return {**previous, "ocmf_status": STATUS_MALFORMED}
+
+        self._body = body
+        if not valid:
+            _LOGGER.warning("%s OCMF signature check failed for reading at %s", self._client.host, reading.time)
+            return {**previous, "ocmf_status": STATUS_INVALID}
+        return {"ocmf_energy": reading.energy, "ocmf_time": reading.time, "ocmf_status": STATUS_VERIFIED}
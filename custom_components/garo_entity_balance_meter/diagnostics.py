@@ -0,0 +1,71 @@
+"""Diagnostics download: per-unit request metrics, tick timings and cached state."""
+from __future__ import annotations
+from typing import TYPE_CHECKING, Any
+
+from homeassistant.components.diagnostics import async_redact_data
+from homeassistant.config_entries import ConfigEntry
+from homeassistant.core import HomeAssistant
+
+from .const import DOMAIN, CONF_USERNAME, CONF_PASSWORD
+
+if TYPE_CHECKING:
+    from .coordinator import GaroCoordinator
+    from .hub import GaroDevice
+
+# The unit ID embeds the MAC address; the device ID is the serial number
+TO_REDACT = {CONF_USERNAME, CONF_PASSWORD, "device_id", "unit_id"}
+
+
+def _coordinator(coordinator: GaroCoordinator) -> dict[str, Any]:
+    return {
+        "update_interval": coordinator.update_interval.total_seconds() if coordinator.update_interval else None,
+        "last_update_success": coordinator.last_update_success,
+        "consecutive_failures": coordinator.consecutive_failures,
+        "total_failures": coordinator.total_failures,
+        "error_rate": coordinator.error_rate,
+        "tick_ms": coordinator.tick_latency.summary(),
+    }
+
+
+def _device(device: GaroDevice) -> dict[str, Any]:
+    client = device.client
+    return {
+        "client": {
+            "base_url": client.base_url,
+            "requests": client.requests,
+            "connections_created": client.connections_created,
+            "connections_reused": client.connections_reused,
+            "breaker": client.breaker.as_dict(),
+            "endpoints": client.metrics.as_dict(),
+        },
+        "meter": {
+            **_coordinator(device.meter),
+            "parse_ms": device.meter.parse_latency.summary(),
+            "data": device.meter.data,
+        },
+        "diagnostics": {**_coordinator(device.diagnostics), "data": device.diagnostics.data},
+        "stats": {**_coordinator(device.stats), "data": device.stats.data},
+        # Parameter values stay out of the download; they can hold site details
+        "config": {
+            **_coordinator(device.config),
+            "groups": {group: len(params) for group, params in (device.config.data or {}).items()},
+        },
+        "ocmf": {
+            **_coordinator(device.ocmf),
+            "verify_ms": device.ocmf.verify_latency.summary(),
+            "data": device.ocmf.data,
+        },
+        "energy": device.energy.as_dict(),
+        "identity": device.identity.values,
+    }
+
+
+async def async_get_config_entry_diagnostics(hass: HomeAssistant, entry: ConfigEntry) -> dict[str, Any]:
+    data = hass.data[DOMAIN][entry.entry_id]
+    return async_redact_data(
+        {
+            "entry": {"title": entry.title, "data": dict(entry.data), "options": dict(entry.options)},
+            "units": {host: _device(device) for host, device in data["devices"].items()},
+        },
+        TO_REDACT,
+    )
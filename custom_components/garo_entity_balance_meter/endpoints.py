@@ -0,0 +1,113 @@
+"""Declarative registry of the slow diagnostic endpoints and the generic decoder."""
+from __future__ import annotations
+import logging
+from typing import Any, Callable, Iterable, NamedTuple
+
+from .const import (
+    API_PATH_TEMPS, API_PATH_FIRMWARE_VERSION, API_PATH_DEVICE_ID, API_PATH_UNIT_ID,
+    API_PATH_NETWORK_INTERFACE, API_PATH_CONNECTION_STATUS, API_PATH_CSMS_STATUS,
+)
+
+_LOGGER = logging.getLogger(__name__)
+
+# Cadence classes: "diagnostics" endpoints are fetched every slow cycle while
+# one of their sensors is enabled; "identity" endpoints only when the identity
+# cache is stale or the firmware changed.
+CADENCE_DIAGNOSTICS = "diagnostics"
+CADENCE_IDENTITY = "identity"
+
+
+class Field(NamedTuple):
+    key: str                          # sensor / cache key
+    aliases: tuple[str, ...] = ()     # object keys probed in order; () takes the scalar value
+    convert: Callable[[Any], Any] = str
+
+
+class Endpoint(NamedTuple):
+    path: str
+    cadence: str
+    decoder: Callable[[Any], Any]
+    fields: tuple[Field, ...]
+    always: bool = False              # fetched even with no enabled sensor
+
+
+def decode_scalar(payload: Any) -> Any:
+    """``{"firmware_version": "1.2"}`` or ``"1.2"`` -> ``"1.2"``."""
+    if isinstance(payload, dict):
+        return next(iter(payload.values()), None)
+    return payload
+
+
+def decode_object(payload: Any) -> dict | None:
+    if isinstance(payload, dict):
+        return payload
+    _LOGGER.debug("Expected a JSON object, got %r", payload)
+    return None
+
+
+def decode_object_or_scalar(payload: Any) -> Any:
+    """An object, or a bare value that stands for the endpoint's single field."""
+    return payload if isinstance(payload, dict) else decode_scalar(payload)
+
+
+ENDPOINTS: tuple[Endpoint, ...] = (
+    Endpoint(API_PATH_TEMPS, CADENCE_DIAGNOSTICS, decode_object, (
+        Field("cpu_temperature", ("cpu",), float),
+        Field("board_temperature", ("base_board", "board", "baseboard", "pcb"), float),
+    )),
+    # Conditional GET that doubles as the change trigger for the identity endpoints
+    Endpoint(API_PATH_FIRMWARE_VERSION, CADENCE_DIAGNOSTICS, decode_scalar, (Field("firmware_version"),), always=True),
+    Endpoint(API_PATH_DEVICE_ID, CADENCE_IDENTITY, decode_scalar, (Field("device_id"),)),
+    Endpoint(API_PATH_UNIT_ID, CADENCE_IDENTITY, decode_scalar, (Field("unit_id"),)),
+    Endpoint(API_PATH_NETWORK_INTERFACE, CADENCE_DIAGNOSTICS, decode_scalar, (Field("network_interface"),)),
+    Endpoint(API_PATH_CONNECTION_STATUS, CADENCE_DIAGNOSTICS, decode_object, (
+        Field("ip_address", ("ip_address", "ip", "address", "ipv4")),
+        Field("wifi_ssid", ("ssid", "SSID", "wifi_ssid")),
+        Field("wifi_signal", ("rssi", "RSSI", "signal", "signal_strength"), float),
+    )),
+    Endpoint(API_PATH_CSMS_STATUS, CADENCE_DIAGNOSTICS, decode_object_or_scalar, (
+        Field("csms_status", ("status", "connected", "state")),
+    )),
+)
+
+ENDPOINT_BY_KEY: dict[str, Endpoint] = {f.key: ep for ep in ENDPOINTS for f in ep.fields}
+
+
+def endpoint_paths(cadence: str, keys: Iterable[str] | None = None) -> tuple[str, ...]:
+    """Paths of one cadence class; with ``keys``, only those feeding one of them (or ``always``)."""
+    wanted = None if keys is None else set(keys)
+    return tuple(
+        ep.path for ep in ENDPOINTS
+        if ep.cadence == cadence
+        and (wanted is None or ep.always or any(f.key in wanted for f in ep.fields))
+    )
+
+
+def _field_value(decoded: Any, field: Field) -> Any:
+    if isinstance(decoded, dict):
+        if not field.aliases:
+            return decode_scalar(decoded)
+        for alias in field.aliases:
+            if decoded.get(alias) is not None:
+                return decoded[alias]
+        return None
+    return decoded
+
+
+def apply_endpoints(results: dict[str, Any], cache: dict[str, Any]) -> None:
+    """Decode a batch of EndpointResults into ``cache``; failed endpoints keep their old values."""
+    for ep in ENDPOINTS:
+        res = results.get(ep.path)
+        if res is None or not res.ok:
+            continue
+        decoded = ep.decoder(res.payload)
+        if decoded is None:
+            continue
+        for field in ep.fields:
+            raw = _field_value(decoded, field)
+            if raw is None:
+                continue
+            try:
+                cache[field.key] = field.convert(raw)
+            except (ValueError, TypeError):
+                _LOGGER.debug("%s: cannot convert %s=%r", ep.path, field.key, raw)
@@ -0,0 +1,139 @@
+"""Integrity checks for the energy import register, with a persisted baseline."""
+from __future__ import annotations
+import logging, time
+from datetime import datetime, timezone
+from typing import Any
+
+from homeassistant.core import HomeAssistant, callback
+from homeassistant.helpers.storage import Store
+
+from .const import (
+    DOMAIN, ENERGY_STORAGE_VERSION, ENERGY_MAX_POWER, ENERGY_POWER_TOLERANCE,
+    ENERGY_MARGIN, ENERGY_CONFIRM_SAMPLES, ENERGY_CONFIDENCE_ALPHA,
+)
+
+_LOGGER = logging.getLogger(__name__)
+
+
+class GaroEnergyGuard:
+    """Last good ``energy`` reading of one unit, and the rules for moving it.
+
+    A reading is accepted when it does not go backwards and its increase
+    fits both the largest plausible load (ENERGY_MAX_POWER over the elapsed
+    time, which also covers gaps after a restart) and, while power samples
+    have been seen since the last good reading, the integral of ``power``.
+    Anything else is held as a candidate: a glitch is dropped as soon as the
+    register is back on track, while ENERGY_CONFIRM_SAMPLES consistent
+    readings from a new level (counter reset, meter swap) make it the new
+    baseline. ``confidence`` is a moving score of how well the register
+    agreed with the power integral.
+    """
+
+    def __init__(self, hass: HomeAssistant, storage_id: str) -> None:
+        self._store: Store[dict[str, Any]] = Store(hass, ENERGY_STORAGE_VERSION, f"{DOMAIN}.energy.{storage_id}")
+        self.value: float | None = None
+        self.at = 0.0                # wall-clock time of the last good reading
+        self.confidence = 1.0
+        self.status = "ok"           # "ok", "held" or "reset"
+        self._integral = 0.0         # Wh of power since the last good reading
+        self._integral_valid = False
+        self._power: tuple[float, float] | None = None
+        self._pending: list[tuple[float, float]] = []
+
+    async def async_load(self) -> None:
+        stored = await self._store.async_load() or {}
+        self.value = stored.get("value")
+        self.at = stored.get("at", 0.0)
+        self.confidence = stored.get("confidence", 1.0)
+
+    @property
+    def attributes(self) -> dict[str, Any]:
+        return {
+            "confidence": round(self.confidence, 2),
+            "integrity": self.status,
+            "last_good": datetime.fromtimestamp(self.at, timezone.utc).isoformat() if self.at else None,
+        }
+
+    def as_dict(self) -> dict[str, Any]:
+        return {
+            "value": self.value,
+            "confidence": round(self.confidence, 2),
+            "integrity": self.status,
+            "last_good": datetime.fromtimestamp(self.at, timezone.utc).isoformat() if self.at else None,
+            "pending": len(self._pending),
+        }
+
+    @staticmethod
+    def _plausible(prev: float, prev_at: float, value: float, now: float) -> bool:
+        return 0 <= value - prev <= ENERGY_MAX_POWER * max(now - prev_at, 0) / 3600 + ENERGY_MARGIN
+
+    def _integrate(self, power: Any, now: float) -> None:
+        if not isinstance(power, (int, float)):
+            self._power = None
+            return
+        if self._power is not None:
+            prev, prev_at = self._power
+            self._integral += (prev + power) / 2 * (now - prev_at) / 3600
+        else:
+            # First power sample since a gap: the integral no longer covers the whole interval
+            self._integral_valid = False
+        self._power = (power, now)
+
+    def _score(self, delta: float) -> float:
+        if not self._integral_valid:
+            return self.confidence
+        return 1.0 - min(1.0, abs(delta - self._integral) / max(self._integral, ENERGY_MARGIN))
+
+    def _accept(self, value: float, now: float, score: float, status: str) -> None:
+        self.confidence += ENERGY_CONFIDENCE_ALPHA * (score - self.confidence)
+        self.value, self.at, self.status = value, now, status
+        self._integral, self._integral_valid = 0.0, self._power is not None
+        self._pending.clear()
+        self._store.async_delay_save(self._data_to_save, 30)
+
+    @callback
+    def async_check(self, values: dict[str, Any], now: float | None = None) -> dict[str, Any]:
+        """Replace ``values["energy"]`` with the last good reading when it does not pass."""
+        now = time.time() if now is None else now
+        self._integrate(values.get("power"), now)
+        raw = values.get("energy")
+        if not isinstance(raw, (int, float)):
+            return values
+        if self.value is None:
+            self._accept(raw, now, 1.0, "ok")
+            return values
+
+        delta = raw - self.value
+        if -ENERGY_MARGIN <= delta < 0:
+            # Rounding noise around the last good value
+            values["energy"] = self.value
+            return values
+        if self._plausible(self.value, self.at, raw, now) and (
+            not self._integral_valid
+            or delta <= self._integral * (1 + ENERGY_POWER_TOLERANCE) + ENERGY_MARGIN
+        ):
+            if self._pending:
+                _LOGGER.debug("Energy register back on track at %.1f, dropping %d held readings", raw, len(self._pending))
+            self._accept(raw, now, self._score(delta), "ok")
+            return values
+
+        if self._pending and self._plausible(*self._pending[-1], raw, now):
+            self._pending.append((raw, now))
+        else:
+            self._pending = [(raw, now)]
+        if len(self._pending) >= ENERGY_CONFIRM_SAMPLES:
+            _LOGGER.warning(
+                "Energy register moved from %.1f to %.1f and stayed there; accepting it as a counter reset or meter swap",
+                self.value, raw,
+            )
+            self._accept(raw, now, 0.0, "reset")
+            return values
+
+        _LOGGER.debug("Energy reading %.1f rejected (last good %.1f, power integral %.1f Wh)", raw, self.value, self._integral)
+        self.confidence += ENERGY_CONFIDENCE_ALPHA * (0.0 - self.confidence)
+        self.status = "held"
+        values["energy"] = self.value
+        return values
+
+    def _data_to_save(self) -> dict[str, Any]:
+        return {"value": self.value, "at": self.at, "confidence": self.confidence}
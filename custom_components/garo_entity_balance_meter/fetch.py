@@ -0,0 +1,108 @@
+"""Concurrent fetch engine for the slow diagnostic endpoints."""
+from __future__ import annotations
+import logging, asyncio, time
+from dataclasses import dataclass
+from typing import Any, Iterable
+
+from .client import GaroClient, decode_payload
+from .const import DEFAULT_FETCH_CONCURRENCY, DEFAULT_FETCH_DEADLINE
+
+_LOGGER = logging.getLogger(__name__)
+
+
+@dataclass
+class EndpointResult:
+    """Outcome of a single endpoint GET within a batch."""
+
+    path: str
+    status: int | None = None
+    payload: Any = None
+    error: str | None = None
+    elapsed: float = 0.0
+    etag: str | None = None
+    last_modified: str | None = None
+
+    @property
+    def ok(self) -> bool:
+        return self.error is None and self.status == 200
+
+    @property
+    def not_modified(self) -> bool:
+        """True for a 304 answer to a conditional request; the cached value still holds."""
+        return self.error is None and self.status == 304
+
+
+class FetchEngine:
+    """Fetch a set of endpoints concurrently under one overall deadline.
+
+    The semaphore is owned by the engine, so one engine per device caps the
+    number of requests in flight against that unit no matter how many
+    batches overlap.
+    """
+
+    def __init__(
+        self,
+        client: GaroClient,
+        *,
+        limit: int = DEFAULT_FETCH_CONCURRENCY,
+        deadline: float = DEFAULT_FETCH_DEADLINE,
+    ) -> None:
+        self._client = client
+        self._semaphore = asyncio.Semaphore(max(1, limit))
+        self._deadline = deadline
+
+    async def _fetch_one(self, path: str, validator: dict[str, str] | None) -> EndpointResult:
+        result = EndpointResult(path)
+        headers = {}
+        if validator:
+            if validator.get("etag"):
+                headers["If-None-Match"] = validator["etag"]
+            if validator.get("last_modified"):
+                headers["If-Modified-Since"] = validator["last_modified"]
+        start = time.monotonic()
+        try:
+            async with self._semaphore:
+                result.status, resp_headers, body = await self._client.async_request(path, headers=headers)
+            result.etag = resp_headers.get("ETag")
+            result.last_modified = resp_headers.get("Last-Modified")
+            if result.status == 200:
+                result.payload = decode_payload(body)
+            elif result.status != 304:
+                result.error = f"HTTP {result.status}"
+        except Exception as err:
+            result.error = str(err) or type(err).__name__
+        result.elapsed = time.monotonic() - start
+        return result
+
+    async def async_fetch(
+        self,
+        paths: Iterable[str],
+        validators: dict[str, dict[str, str]] | None = None,
+    ) -> dict[str, EndpointResult]:
+        """Fetch all paths; endpoints still pending at the deadline report a timeout.
+
+        ``validators`` maps a path to the ETag/Last-Modified of its last
+        answer, which turns that GET into a conditional request.
+        """
+        validators = validators or {}
+        tasks = {
+            path: asyncio.create_task(self._fetch_one(path, validators.get(path)))
+            for path in dict.fromkeys(paths)
+        }
+        if not tasks:
+            return {}
+        done, pending = await asyncio.wait(tasks.values(), timeout=self._deadline)
+        for task in pending:
+            task.cancel()
+        if pending:
+            await asyncio.gather(*pending, return_exceptions=True)
+
+        results: dict[str, EndpointResult] = {}
+        for path, task in tasks.items():
+            if task in done:
+                results[path] = task.result()
+            else:
+                results[path] = EndpointResult(path, error="timeout", elapsed=self._deadline)
+            if results[path].error:
+                _LOGGER.debug("%s fetch failed: %s", path, results[path].error)
+        return results
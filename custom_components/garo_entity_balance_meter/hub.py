@@ -0,0 +1,70 @@
+"""Per-device runtime state and the shared scheduler for hub mode."""
+from __future__ import annotations
+import asyncio
+from dataclasses import dataclass
+from typing import TYPE_CHECKING
+
+from .client import GaroClient
+
+if TYPE_CHECKING:
+    # __init__ only needs the hub; the coordinators load with the sensor platform
+    from .coordinator import (
+        GaroCoordinator, GaroMeterCoordinator, GaroDiagnosticsCoordinator, GaroStatsCoordinator,
+        GaroConfigCoordinator, GaroOcmfCoordinator,
+    )
+    from .identity import GaroIdentityCache
+    from .energy import GaroEnergyGuard
+
+
+@dataclass
+class GaroDevice:
+    """Everything one Entity Balance unit needs at runtime."""
+
+    client: GaroClient
+    meter: GaroMeterCoordinator
+    diagnostics: GaroDiagnosticsCoordinator
+    stats: GaroStatsCoordinator
+    identity: GaroIdentityCache
+    energy: GaroEnergyGuard
+    config: GaroConfigCoordinator
+    ocmf: GaroOcmfCoordinator
+    identifier: tuple[str, str]
+    unique_prefix: str
+    label: str | None = None
+
+    def coordinator_for(self, source: str | None) -> GaroCoordinator:
+        """The coordinator feeding a SENSOR_MAP entry's ``source``; the meter by default."""
+        if source == "diagnostics":
+            return self.diagnostics
+        if source == "stats":
+            return self.stats
+        if source == "ocmf":
+            return self.ocmf
+        return self.meter
+
+
+class GaroHub:
+    """Shared scheduler for the units of one config entry.
+
+    ``limiter`` caps the requests in flight across all units; ``stagger``
+    spreads the first poll of each unit evenly over its interval so the
+    fleet does not fire in bursts. ``stagger_first_refresh`` does the same
+    for coordinators whose first refresh runs in the background (see
+    GaroCoordinator.async_refresh_later).
+    """
+
+    def __init__(self, max_concurrent: int | None) -> None:
+        self.limiter = asyncio.Semaphore(max_concurrent) if max_concurrent else None
+
+    @staticmethod
+    def stagger(coordinators: list[GaroCoordinator]) -> None:
+        count = len(coordinators)
+        for index, coordinator in enumerate(coordinators):
+            if index:
+                coordinator.async_delay_next_refresh(coordinator.base_interval * index / count)
+
+    @staticmethod
+    def stagger_first_refresh(coordinators: list[GaroCoordinator]) -> None:
+        count = len(coordinators)
+        for index, coordinator in enumerate(coordinators):
+            coordinator.first_refresh_delay = coordinator.base_interval * index / count
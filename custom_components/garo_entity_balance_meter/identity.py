@@ -0,0 +1,95 @@
+"""Persistent cache for the device identity (firmware, device ID, unit ID)."""
+from __future__ import annotations
+import logging, time
+from typing import Any
+
+from homeassistant.core import HomeAssistant, callback
+from homeassistant.helpers import device_registry as dr
+from homeassistant.helpers.storage import Store
+
+from .const import DOMAIN, IDENTITY_STORAGE_VERSION, IDENTITY_REVALIDATE_INTERVAL
+from .endpoints import ENDPOINTS
+from .fetch import EndpointResult
+
+_LOGGER = logging.getLogger(__name__)
+
+IDENTITY_KEYS = ("firmware_version", "device_id", "unit_id")
+# Validators are only persisted for endpoints whose values are persisted too;
+# after a restart a 304 for any other endpoint would leave its sensor unknown
+IDENTITY_PATHS = frozenset(ep.path for ep in ENDPOINTS if all(f.key in IDENTITY_KEYS for f in ep.fields))
+
+
+def mac_from_unit_id(unit_id: str | None) -> str | None:
+    """Return the MAC address embedded in a unit ID like ``GaroLI-001122AABBCC``."""
+    if unit_id and "-" in unit_id:
+        mac_raw = unit_id.split("-")[-1]
+        if len(mac_raw) == 12 and all(c in "0123456789ABCDEFabcdef" for c in mac_raw):
+            return ":".join(mac_raw[i:i+2] for i in range(0, 12, 2)).upper()
+    return None
+
+
+class GaroIdentityCache:
+    """Identity values and HTTP validators for one unit, kept in a Store.
+
+    Loaded at startup so device info is available before the first network
+    round trip; the identity endpoints are only fetched again when the cache
+    is older than IDENTITY_REVALIDATE_INTERVAL or the firmware changes.
+    ``validators`` covers every diagnostics endpoint for the running
+    session; only those of IDENTITY_PATHS survive a restart.
+    """
+
+    def __init__(self, hass: HomeAssistant, storage_id: str) -> None:
+        self._store: Store[dict[str, Any]] = Store(hass, IDENTITY_STORAGE_VERSION, f"{DOMAIN}.identity.{storage_id}")
+        self.values: dict[str, str] = {}
+        self.validators: dict[str, dict[str, str]] = {}
+        self.checked_at = 0.0
+        self.connections: set[tuple[str, str]] = set()
+
+    async def async_load(self) -> None:
+        stored = await self._store.async_load() or {}
+        self.values = {k: v for k, v in stored.get("values", {}).items() if k in IDENTITY_KEYS}
+        self.validators = {p: v for p, v in stored.get("validators", {}).items() if p in IDENTITY_PATHS}
+        self.checked_at = stored.get("checked_at", 0.0)
+        self._update_connections()
+
+    @property
+    def stale(self) -> bool:
+        return not self.values or time.time() - self.checked_at > IDENTITY_REVALIDATE_INTERVAL
+
+    def _update_connections(self) -> None:
+        mac = mac_from_unit_id(self.values.get("unit_id"))
+        self.connections = {(dr.CONNECTION_NETWORK_MAC, mac)} if mac else set()
+
+    @callback
+    def async_update(
+        self,
+        results: dict[str, EndpointResult],
+        values: dict[str, Any],
+        revalidated: bool,
+    ) -> bool:
+        """Take identity values and validators from a batch; return True if an identity value changed."""
+        dirty = False
+        for res in results.values():
+            if res.ok and (res.etag or res.last_modified):
+                validator = {"etag": res.etag, "last_modified": res.last_modified}
+                if self.validators.get(res.path) != validator:
+                    self.validators[res.path] = validator
+                    dirty = dirty or res.path in IDENTITY_PATHS
+        changed = False
+        for key in IDENTITY_KEYS:
+            if key in values and values[key] != self.values.get(key):
+                _LOGGER.debug("Identity %s: %r -> %r", key, self.values.get(key), values[key])
+                self.values[key] = values[key]
+                changed = True
+        if revalidated:
+            self.checked_at = time.time()
+            dirty = True
+        if changed:
+            self._update_connections()
+        if changed or dirty:
+            self._store.async_delay_save(self._data_to_save, 10)
+        return changed
+
+    def _data_to_save(self) -> dict[str, Any]:
+        validators = {p: v for p, v in self.validators.items() if p in IDENTITY_PATHS}
+        return {"values": self.values, "validators": validators, "checked_at": self.checked_at}
@@ -0,0 +1,117 @@
+"""Low-overhead request counters and latency histograms for diagnostics.
+
+Each client keeps a ``RequestMetrics`` with one ``EndpointMetrics`` per
+path: request, byte, status, timeout and error counts plus a log-scale latency
+histogram that answers percentiles without storing samples.
+"""
+from __future__ import annotations
+from bisect import bisect_left
+from collections import Counter
+from typing import Any
+
+# Bucket upper bounds in seconds: 10 us to ~100 s in sqrt(2) steps
+_BOUNDS: tuple[float, ...] = tuple(1e-5 * 2 ** (i / 2) for i in range(47))
+
+
+class LatencyHistogram:
+    """Fixed log-scale buckets; recording is one bisect and an increment.
+
+    Percentiles are the upper bound of the bucket holding the rank, so they
+    are accurate to one bucket (a factor of about 1.41).
+    """
+
+    __slots__ = ("counts", "count", "total", "max")
+
+    def __init__(self) -> None:
+        self.counts = [0] * (len(_BOUNDS) + 1)
+        self.count = 0
+        self.total = 0.0
+        self.max = 0.0
+
+    def record(self, seconds: float) -> None:
+        self.counts[bisect_left(_BOUNDS, seconds)] += 1
+        self.count += 1
+        self.total += seconds
+        if seconds > self.max:
+            self.max = seconds
+
+    def percentile(self, pct: float) -> float | None:
+        if not self.count:
+            return None
+        rank = pct / 100 * self.count
+        seen = 0
+        for index, n in enumerate(self.counts):
+            seen += n
+            if seen >= rank and n:
+                return min(_BOUNDS[index], self.max) if index < len(_BOUNDS) else self.max
+        return self.max
+
+    def summary(self, scale: float = 1000.0) -> dict[str, Any]:
+        """Count, mean, p50/p95/p99 and max, in milliseconds by default."""
+        def fmt(val: float | None) -> float | None:
+            return round(val * scale, 3) if val is not None else None
+
+        return {
+            "count": self.count,
+            "mean": fmt(self.total / self.count if self.count else None),
+            "p50": fmt(self.percentile(50)),
+            "p95": fmt(self.percentile(95)),
+            "p99": fmt(self.percentile(99)),
+            "max": fmt(self.max if self.count else None),
+        }
+
+
+class EndpointMetrics:
+    """Counters for one endpoint path."""
+
+    __slots__ = ("requests", "bytes", "statuses", "timeouts", "errors", "latency")
+
+    def __init__(self) -> None:
+        self.requests = 0
+        self.bytes = 0
+        self.statuses: Counter[int] = Counter()
+        self.timeouts = 0
+        self.errors = 0
+        self.latency = LatencyHistogram()
+
+    def as_dict(self) -> dict[str, Any]:
+        return {
+            "requests": self.requests,
+            "bytes": self.bytes,
+            "statuses": {str(status): n for status, n in sorted(self.statuses.items())},
+            "timeouts": self.timeouts,
+            "errors": self.errors,
+            "latency_ms": self.latency.summary(),
+        }
+
+
+class RequestMetrics:
+    """Per-endpoint metrics of one client, created on first use of a path."""
+
+    def __init__(self) -> None:
+        self.endpoints: dict[str, EndpointMetrics] = {}
+
+    def _endpoint(self, path: str) -> EndpointMetrics:
+        metrics = self.endpoints.get(path)
+        if metrics is None:
+            metrics = self.endpoints[path] = EndpointMetrics()
+        return metrics
+
+    def record(self, path: str, status: int, size: int, elapsed: float) -> None:
+        metrics = self._endpoint(path)
+        metrics.requests += 1
+        metrics.bytes += size
+        metrics.statuses[status] += 1
+        metrics.latency.record(elapsed)
+
+    def record_failure(self, path: str, elapsed: float, *, timeout: bool) -> None:
+        metrics = self._endpoint(path)
+        metrics.requests += 1
+        if timeout:
+            metrics.timeouts += 1
+        else:
+            metrics.errors += 1
+        metrics.latency.record(elapsed)
+
+    def as_dict(self) -> dict[str, Any]:
+        return {path: metrics.as_dict() for path, metrics in sorted(self.endpoints.items())}
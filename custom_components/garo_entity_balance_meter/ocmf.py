@@ -0,0 +1,135 @@
+"""OCMF signed meter readings: parsing of the Transparenzsoftware XML and signature checks.
+
+Parsing is cheap and runs on the event loop. ``verify_signature`` is
+blocking crypto work and imports ``cryptography`` on first use; call it
+from the executor.
+"""
+from __future__ import annotations
+import base64, binascii, json
+import xml.etree.ElementTree as ET
+from typing import Any, NamedTuple
+
+# Verification status, exposed as the options of the status sensor. None of them
+# may be "unavailable" or "unknown", which Home Assistant reserves for the entity.
+STATUS_VERIFIED = "verified"
+STATUS_INVALID = "invalid"
+STATUS_NO_KEY = "no_key"
+STATUS_NO_READING = "no_reading"
+STATUS_MALFORMED = "malformed"
+STATUSES = [STATUS_VERIFIED, STATUS_INVALID, STATUS_NO_KEY, STATUS_NO_READING, STATUS_MALFORMED]
+
+# OBIS codes of the active import register, in the spellings meters use
+IMPORT_REGISTERS = ("1-b:1.8.0", "1-0:1.8.0", "01-00:01.08.00.FF")
+_TO_KWH = {"kWh": 1.0, "Wh": 0.001}
+# Hash named by the algorithm suffix, e.g. ECDSA-secp384r1-SHA384; the curve comes from the key
+_DIGESTS = ("SHA256", "SHA384", "SHA512")
+
+
+class OcmfError(ValueError):
+    """The payload is not a readable OCMF string."""
+
+
+class OcmfReading(NamedTuple):
+    signed: str                  # the full "OCMF|payload|signature" string
+    payload: str                 # the signed bytes, exactly as sent
+    signature: bytes             # DER-encoded ECDSA signature
+    algorithm: str
+    public_key: str | None       # from the XML, when included; never trusted for verification
+    energy: float | None         # active import register, kWh
+    time: str | None
+
+
+def _text(element: ET.Element | None) -> str | None:
+    if element is None or element.text is None:
+        return None
+    return element.text.strip() or None
+
+
+def parse_ocmf_xml(text: str) -> OcmfReading:
+    """Last signed value of a Transparenzsoftware document, or a bare OCMF string."""
+    text = text.strip()
+    if text.startswith("OCMF|"):
+        return parse_ocmf(text)
+    try:
+        root = ET.fromstring(text)
+    except ET.ParseError as err:
+        raise OcmfError(f"Not XML: {err}") from err
+    values = root.findall(".//value") or [root]
+    value = values[-1]
+    signed = _text(value.find("signedData"))
+    if signed is None:
+        raise OcmfError("No signedData element")
+    return parse_ocmf(signed, _text(value.find("publicKey")))
+
+
+def _decode(data: str, encoding: str) -> bytes:
+    try:
+        return base64.b64decode(data, validate=True) if encoding == "base64" else bytes.fromhex(data)
+    except (binascii.Error, ValueError) as err:
+        raise OcmfError(f"Bad {encoding} data") from err
+
+
+def _energy(payload: dict[str, Any]) -> tuple[float | None, str | None]:
+    readings = [r for r in payload.get("RD") or () if isinstance(r, dict) and r.get("RU") in _TO_KWH]
+    registers = [r for r in readings if r.get("RI") in IMPORT_REGISTERS] or readings
+    if not registers:
+        return None, None
+    last = registers[-1]
+    try:
+        return float(last["RV"]) * _TO_KWH[last["RU"]], last.get("TM")
+    except (KeyError, TypeError, ValueError):
+        return None, last.get("TM")
+
+
+def parse_ocmf(signed: str, public_key: str | None = None) -> OcmfReading:
+    """Split ``OCMF|{payload}|{signature}`` and read the import register from the payload."""
+    header, _, rest = signed.strip().partition("|")
+    payload, _, signature = rest.rpartition("|")
+    if header != "OCMF" or not payload:
+        raise OcmfError("Not an OCMF string")
+    try:
+        data, sig = json.loads(payload), json.loads(signature)
+    except ValueError as err:
+        raise OcmfError(f"Bad OCMF JSON: {err}") from err
+    if not isinstance(data, dict) or not isinstance(sig, dict) or not sig.get("SD"):
+        raise OcmfError("OCMF string without payload or signature data")
+    energy, at = _energy(data)
+    return OcmfReading(
+        signed=signed.strip(),
+        payload=payload,
+        signature=_decode(sig["SD"], sig.get("SE", "hex")),
+        algorithm=sig.get("SA", "ECDSA-secp256r1-SHA256"),
+        public_key=public_key,
+        energy=energy,
+        time=at,
+    )
+
+
+def verify_signature(reading: OcmfReading, public_key: str) -> bool:
+    """Check the ECDSA signature over the payload against a hex, base64 or PEM key. Blocking."""
+    from cryptography.exceptions import InvalidSignature, UnsupportedAlgorithm
+    from cryptography.hazmat.primitives import hashes, serialization
+    from cryptography.hazmat.primitives.asymmetric import ec
+
+    key_text = public_key.strip()
+    try:
+        if key_text.startswith("-----BEGIN"):
+            key = serialization.load_pem_public_key(key_text.encode())
+        else:
+            try:
+                der = bytes.fromhex(key_text)
+            except ValueError:
+                der = base64.b64decode(key_text)
+            key = serialization.load_der_public_key(der)
+    except (ValueError, binascii.Error, UnsupportedAlgorithm) as err:
+        raise OcmfError(f"Unreadable public key: {err}") from err
+    if not isinstance(key, ec.EllipticCurvePublicKey):
+        raise OcmfError(f"Unsupported key type {type(key).__name__}")
+
+    digest = reading.algorithm.rpartition("-")[2]
+    digest = getattr(hashes, digest)() if digest in _DIGESTS else hashes.SHA256()
+    try:
+        key.verify(reading.signature, reading.payload.encode(), ec.ECDSA(digest))
+    except InvalidSignature:
+        return False
+    return True
@@ -0,0 +1,114 @@
+"""Energy-meter payload parser driven by a declarative measurand spec.
+
+``MEASURANDS`` maps each OCPP measurand and phase to a sensor key.
+``build_table`` turns the spec into a two-level lookup that
+``parse_meter_payload`` walks once per sampled value, and
+``sensor_map_entries`` derives the matching SENSOR_MAP entries.
+"""
+from __future__ import annotations
+from typing import Any, NamedTuple
+
+
+class Measurand(NamedTuple):
+    key: str
+    measurand: str
+    phase: str | None
+    name: str
+    device_class: str | None
+    unit: str | None
+    state_class: str | None
+    enabled_default: bool = True
+
+
+# Names of the first eight entries are kept identical to the original SENSOR_MAP
+# to preserve entity IDs and long-term statistics. A phase of None matches any
+# phase for measurands without per-phase entries.
+MEASURANDS: tuple[Measurand, ...] = (
+    Measurand("power",      "Power.Active.Import",           None,   "Power Consumption", "power",   "W",  "measurement"),
+    Measurand("energy",     "Energy.Active.Import.Register", None,   "Energy Total",      "energy",  "Wh", "total_increasing"),
+    Measurand("current_l1", "Current.Import",                "L1",   "Current L1",        "current", "A",  "measurement"),
+    Measurand("current_l2", "Current.Import",                "L2",   "Current L2",        "current", "A",  "measurement"),
+    Measurand("current_l3", "Current.Import",                "L3",   "Current L3",        "current", "A",  "measurement"),
+    Measurand("voltage_l1", "Voltage",                       "L1-N", "Voltage L1",        "voltage", "V",  "measurement"),
+    Measurand("voltage_l2", "Voltage",                       "L2-N", "Voltage L2",        "voltage", "V",  "measurement"),
+    Measurand("voltage_l3", "Voltage",                       "L3-N", "Voltage L3",        "voltage", "V",  "measurement"),
+    # --- Additional OCMF measurands, disabled by default ---
+    Measurand("power_l1",        "Power.Active.Import",             "L1", "Power L1",               "power",          "W",    "measurement",      False),
+    Measurand("power_l2",        "Power.Active.Import",             "L2", "Power L2",               "power",          "W",    "measurement",      False),
+    Measurand("power_l3",        "Power.Active.Import",             "L3", "Power L3",               "power",          "W",    "measurement",      False),
+    Measurand("power_export",    "Power.Active.Export",             None, "Power Export",           "power",          "W",    "measurement",      False),
+    Measurand("energy_export",   "Energy.Active.Export.Register",   None, "Energy Export Total",    "energy",         "Wh",   "total_increasing", False),
+    Measurand("reactive_power",  "Power.Reactive.Import",           None, "Reactive Power",         "reactive_power", "var",  "measurement",      False),
+    Measurand("reactive_power_export", "Power.Reactive.Export",     None, "Reactive Power Export",  "reactive_power", "var",  "measurement",      False),
+    Measurand("reactive_energy", "Energy.Reactive.Import.Register", None, "Reactive Energy Total",  None,             "varh", "total_increasing", False),
+    Measurand("frequency",       "Frequency",                       None, "Frequency",              "frequency",      "Hz",   "measurement",      False),
+    Measurand("power_factor",    "Power.Factor",                    None, "Power Factor",           "power_factor",   None,   "measurement",      False),
+)
+
+
+Table = dict[str, "str | dict[str | None, str]"]
+
+
+def build_table(spec: tuple[Measurand, ...] = MEASURANDS) -> Table:
+    """Return ``measurand -> key`` for measurands mapped regardless of phase, else ``measurand -> {phase: key}``.
+
+    A measurand with per-phase entries only maps the phases it lists, so a
+    phased value never falls through to the total (e.g. Power.Active.Import
+    L2-N is dropped rather than read as power).
+    """
+    phased = {m.measurand for m in spec if m.phase is not None}
+    table: Table = {}
+    for m in spec:
+        if m.measurand in phased:
+            table.setdefault(m.measurand, {})[m.phase] = m.key
+        else:
+            table[m.measurand] = m.key
+    return table
+
+
+_TABLE = build_table()
+
+
+def parse_meter_payload(payload: Any, table: Table = _TABLE) -> dict[str, float]:
+    """Map the sampledValue entries of an energy-meter payload to sensor keys.
+
+    One dict lookup per value on the measurand, a second on the phase only
+    for phased measurands; the table is never written to.
+    """
+    result: dict[str, float] = {}
+    lookup = table.get
+    if isinstance(payload, dict):
+        payload = (payload,)
+    for block in payload:
+        for sv in block.get("sampledValue", ()):
+            get = sv.get
+            key = lookup(get("measurand"))
+            if key is None:
+                continue
+            if key.__class__ is dict:
+                key = key.get(get("phase"))
+                if key is None:
+                    continue
+            raw = get("value")
+            if raw is None:
+                continue
+            try:
+                result[key] = float(raw)
+            except (ValueError, TypeError):
+                continue
+    return result
+
+
+def sensor_map_entries(spec: tuple[Measurand, ...] = MEASURANDS) -> dict[str, dict[str, Any]]:
+    """SENSOR_MAP-shaped entries for the spec, with device/state classes as plain strings."""
+    entries: dict[str, dict[str, Any]] = {}
+    for m in spec:
+        entries[m.key] = {
+            "name": m.name,
+            "device_class": m.device_class,
+            "unit": m.unit,
+            "state_class": m.state_class,
+        }
+        if not m.enabled_default:
+            entries[m.key]["enabled_default"] = False
+    return entries
@@ -0,0 +1,127 @@
+"""Fuse headroom, phase imbalance, apparent power and time-to-trip from the per-phase values.
+
+Samples go into a ring of array columns; ``PhaseEngine.evaluate``
+integrates a thermal trip model over the samples added since its last
+call and derives the published values from the newest one.
+"""
+from __future__ import annotations
+from array import array
+from typing import Any
+
+PHASES = ("l1", "l2", "l3")
+CURRENTS = tuple(f"current_{p}" for p in PHASES)
+VOLTAGES = tuple(f"voltage_{p}" for p in PHASES)
+
+# Thermal trip model, calibrated on the conventional tripping current of gG
+# fuses and type B/C breakers up to 63 A: 1.45 x rated current trips within
+# one hour. Overload heat (I / In)^2 - 1 is integrated over time (it cools at
+# the same rate below the rating) and the fuse trips at TRIP_HEAT.
+TRIP_RATIO = 1.45
+TRIP_TIME = 3600.0
+TRIP_HEAT = (TRIP_RATIO ** 2 - 1) * TRIP_TIME
+
+# Below this mean phase current the imbalance reads 0 instead of amplifying noise
+IMBALANCE_MIN_CURRENT = 1.0      # A
+
+DERIVED_KEYS = (
+    *(f"headroom_{p}" for p in PHASES), "headroom", "phase_imbalance", "apparent_power", "time_to_trip",
+)
+
+
+class PhaseRing:
+    """Recent three-phase samples, one array column per value, in a fixed-size ring."""
+
+    __slots__ = ("_columns", "_head", "_count", "_seq")
+
+    def __init__(self, capacity: int) -> None:
+        # time, current L1..L3, voltage L1..L3
+        self._columns = tuple(array("d", bytes(8 * capacity)) for _ in range(7))
+        self._head = 0
+        self._count = 0
+        self._seq = 0        # total samples ever added
+
+    def __len__(self) -> int:
+        return self._count
+
+    @property
+    def seq(self) -> int:
+        return self._seq
+
+    def add(self, now: float, currents: tuple[float, ...], voltages: tuple[float, ...]) -> None:
+        for column, value in zip(self._columns, (now, *currents, *voltages)):
+            column[self._head] = value
+        capacity = len(self._columns[0])
+        self._head = (self._head + 1) % capacity
+        self._count = min(self._count + 1, capacity)
+        self._seq += 1
+
+    def since(self, seq: int) -> list[tuple[float, ...]]:
+        """Samples added after sequence number ``seq`` that are still in the ring, oldest first."""
+        capacity = len(self._columns[0])
+        count = min(self._seq - seq, self._count)
+        start = self._head - count
+        return list(zip(*(
+            [column[i % capacity] for i in range(start, self._head)] for column in self._columns
+        )))
+
+
+class PhaseEngine:
+    """Derived per-phase values, evaluated in batch over the samples added since the last call.
+
+    ``add`` only stores a sample. ``evaluate`` integrates the trip model
+    over every pending sample in one pass and derives the published values
+    from the newest one; with no ``fuse`` (A) the headroom and time-to-trip
+    stay None. ``capacity`` should hold every sample between two calls, or
+    the oldest ones drop out of the integral.
+    """
+
+    def __init__(self, fuse: float | None, capacity: int = 64) -> None:
+        self.fuse = fuse or None
+        self.heat = 0.0                  # s at (I/In)^2 - 1 = 1, see TRIP_HEAT
+        self._ring = PhaseRing(capacity)
+        self._evaluated = 0              # ring seq up to which heat is integrated
+        self._last: tuple[float, ...] | None = None
+        self._result: dict[str, float | None] = dict.fromkeys(DERIVED_KEYS)
+
+    def add(self, now: float, values: dict[str, Any]) -> None:
+        currents = tuple(values.get(key) for key in CURRENTS)
+        if None in currents:
+            return
+        voltages = tuple(values.get(key) or 0.0 for key in VOLTAGES)
+        self._ring.add(now, currents, voltages)
+
+    def _integrate(self, samples: list[tuple[float, ...]]) -> None:
+        """Trapezoidal heat integral of the worst phase over ``samples``."""
+        fuse = self.fuse
+        last = self._last
+        for sample in samples:
+            load = (max(sample[1:4]) / fuse) ** 2 - 1
+            if last is not None:
+                previous = (max(last[1:4]) / fuse) ** 2 - 1
+                self.heat = max(self.heat + (load + previous) / 2 * (sample[0] - last[0]), 0.0)
+            last = sample
+
+    def evaluate(self) -> dict[str, float | None]:
+        samples = self._ring.since(self._evaluated)
+        self._evaluated = self._ring.seq
+        if not samples:
+            return self._result
+        if self.fuse:
+            self._integrate(samples)
+        self._last = newest = samples[-1]
+        currents, voltages = newest[1:4], newest[4:7]
+
+        result: dict[str, float | None] = dict.fromkeys(DERIVED_KEYS)
+        mean = sum(currents) / 3
+        result["phase_imbalance"] = (
+            round(max(abs(i - mean) for i in currents) / mean * 100, 1) if mean >= IMBALANCE_MIN_CURRENT else 0.0
+        )
+        result["apparent_power"] = round(sum(v * i for v, i in zip(voltages, currents)), 1)
+        if self.fuse:
+            for phase, current in zip(PHASES, currents):
+                result[f"headroom_{phase}"] = round(self.fuse - current, 2)
+            result["headroom"] = round(self.fuse - max(currents), 2)
+            load = (max(currents) / self.fuse) ** 2 - 1
+            result["time_to_trip"] = round(max(TRIP_HEAT - self.heat, 0.0) / load) if load > 0 else None
+        self._result = result
+        return result
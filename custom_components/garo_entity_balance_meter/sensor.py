@@ -1,319 +1,397 @@
 from __future__ import annotations
-import logging, asyncio, aiohttp
-from datetime import timedelta
+import logging, math, time
+from dataclasses import dataclass
 from homeassistant.config_entries import ConfigEntry
-from homeassistant.core import HomeAssistant
-from homeassistant.helpers.update_coordinator import DataUpdateCoordinator, CoordinatorEntity
+from homeassistant.core import HomeAssistant, callback
+from homeassistant.helpers.update_coordinator import CoordinatorEntity
 from homeassistant.helpers.entity import DeviceInfo, EntityCategory
-from homeassistant.helpers import aiohttp_client, device_registry as dr
-from homeassistant.components.sensor import SensorEntity, SensorDeviceClass, SensorStateClass
+from homeassistant.components.sensor import SensorEntity, SensorEntityDescription, SensorDeviceClass, SensorStateClass
 from homeassistant.const import (
-    UnitOfElectricCurrent, UnitOfElectricPotential, UnitOfPower, UnitOfEnergy, UnitOfTemperature
+    PERCENTAGE, UnitOfApparentPower, UnitOfElectricCurrent, UnitOfEnergy, UnitOfTemperature, UnitOfTime,
 )
+from homeassistant.helpers import entity_registry as er
 from homeassistant.helpers.entity_platform import AddEntitiesCallback
 
 from .const import (
-    DOMAIN, CONF_HOST, CONF_USERNAME, CONF_PASSWORD,
-    CONF_SCAN_INTERVAL, CONF_SLOW_SCAN_INTERVAL,
-    CONF_IGNORE_TLS_ERRORS, CONF_USE_HTTP,
-    DEFAULT_SCAN_INTERVAL, DEFAULT_SLOW_SCAN_INTERVAL,
-    MANUFACTURER, PRODUCT_NAME, API_PATH,
+    DOMAIN,
+    CONF_SCAN_INTERVAL, CONF_SLOW_SCAN_INTERVAL, CONF_PUSH_MODE, CONF_ADAPTIVE_POLLING,
+    CONF_HUB, CONF_DEADBAND_POWER, CONF_DEADBAND_CURRENT, CONF_DEADBAND_VOLTAGE, CONF_MAX_STATE_AGE,
+    DEFAULT_DEADBAND_POWER, DEFAULT_DEADBAND_CURRENT, DEFAULT_DEADBAND_VOLTAGE, DEFAULT_MAX_STATE_AGE,
+    CONF_FUSE_SIZE, CONF_THRESHOLD_HEADROOM, CONF_THRESHOLD_IMBALANCE, CONF_THRESHOLD_TIME_TO_TRIP,
+    DEFAULT_THRESHOLD_HEADROOM, DEFAULT_THRESHOLD_IMBALANCE, DEFAULT_THRESHOLD_TIME_TO_TRIP,
+    DEFAULT_SCAN_INTERVAL, DEFAULT_SLOW_SCAN_INTERVAL, DEFAULT_STATS_INTERVAL, CONF_STATS_INTERVAL,
+    MANUFACTURER, PRODUCT_NAME,
 )
+from .fetch import FetchEngine
+from .coordinator import (
+    GaroMeterCoordinator, GaroDiagnosticsCoordinator, GaroStatsCoordinator, GaroConfigCoordinator, GaroOcmfCoordinator,
+)
+from .ocmf import STATUSES as OCMF_STATUSES
+from .stream import GaroEventStream
+from .parser import sensor_map_entries
+from .stats import DERIVED
+from .phases import PHASES
+from .identity import GaroIdentityCache
+from .energy import GaroEnergyGuard
+from .hub import GaroDevice
 
 _LOGGER = logging.getLogger(__name__)
 
-API_PATH_TEMPS               = "/status/temperatures"
-API_PATH_FIRMWARE_VERSION    = "/config/firmware-version"
-API_PATH_DEVICE_ID           = "/config/device-id"
-API_PATH_UNIT_ID             = "/config/unit-id"
-API_PATH_NETWORK_INTERFACE   = "/netconf/network-interface"
-API_PATH_CONNECTION_STATUS   = "/netconf/connection-status"
-API_PATH_CSMS_STATUS         = "/netconf/csms-connection-status"
+def _ha_classes(info: dict) -> dict:
+    return {
+        **info,
+        "device_class": SensorDeviceClass(info["device_class"]) if info["device_class"] else None,
+        "state_class": SensorStateClass(info["state_class"]) if info["state_class"] else None,
+    }
+
 
 SENSOR_MAP = {
-    # --- Fast (energy meter) — names kept identical to original to preserve entity IDs and LTS ---
-    "power":      {"name": "Power Consumption", "device_class": SensorDeviceClass.POWER,   "unit": UnitOfPower.WATT,             "state_class": SensorStateClass.MEASUREMENT},
-    "energy":     {"name": "Energy Total",      "device_class": SensorDeviceClass.ENERGY,  "unit": UnitOfEnergy.WATT_HOUR,       "state_class": SensorStateClass.TOTAL_INCREASING},
-    "current_l1": {"name": "Current L1",        "device_class": SensorDeviceClass.CURRENT, "unit": UnitOfElectricCurrent.AMPERE, "state_class": SensorStateClass.MEASUREMENT},
-    "current_l2": {"name": "Current L2",        "device_class": SensorDeviceClass.CURRENT, "unit": UnitOfElectricCurrent.AMPERE, "state_class": SensorStateClass.MEASUREMENT},
-    "current_l3": {"name": "Current L3",        "device_class": SensorDeviceClass.CURRENT, "unit": UnitOfElectricCurrent.AMPERE, "state_class": SensorStateClass.MEASUREMENT},
-    "voltage_l1": {"name": "Voltage L1",        "device_class": SensorDeviceClass.VOLTAGE, "unit": UnitOfElectricPotential.VOLT, "state_class": SensorStateClass.MEASUREMENT},
-    "voltage_l2": {"name": "Voltage L2",        "device_class": SensorDeviceClass.VOLTAGE, "unit": UnitOfElectricPotential.VOLT, "state_class": SensorStateClass.MEASUREMENT},
-    "voltage_l3": {"name": "Voltage L3",        "device_class": SensorDeviceClass.VOLTAGE, "unit": UnitOfElectricPotential.VOLT, "state_class": SensorStateClass.MEASUREMENT},
+    # --- Fast (energy meter) — generated from parser.MEASURANDS ---
+    **{key: _ha_classes(info) for key, info in sensor_map_entries().items()},
+    # --- Phase engine (evaluated on the statistics interval, disabled by default) ---
+    **{
+        f"headroom_{phase}": {"name": f"Fuse Headroom {phase.upper()}", "device_class": SensorDeviceClass.CURRENT, "unit": UnitOfElectricCurrent.AMPERE, "state_class": SensorStateClass.MEASUREMENT, "enabled_default": False, "source": "stats"}
+        for phase in PHASES
+    },
+    "headroom":           {"name": "Fuse Headroom",      "device_class": SensorDeviceClass.CURRENT, "unit": UnitOfElectricCurrent.AMPERE, "state_class": SensorStateClass.MEASUREMENT, "enabled_default": False, "source": "stats"},
+    "phase_imbalance":    {"name": "Phase Imbalance",    "device_class": None, "unit": PERCENTAGE, "state_class": SensorStateClass.MEASUREMENT, "enabled_default": False, "source": "stats"},
+    "apparent_power":     {"name": "Apparent Power",     "device_class": SensorDeviceClass.APPARENT_POWER, "unit": UnitOfApparentPower.VOLT_AMPERE, "state_class": SensorStateClass.MEASUREMENT, "enabled_default": False, "source": "stats"},
+    "time_to_trip":       {"name": "Fuse Time to Trip",  "device_class": SensorDeviceClass.DURATION, "unit": UnitOfTime.SECONDS, "state_class": SensorStateClass.MEASUREMENT, "enabled_default": False, "source": "stats"},
+    # --- Meter coordinator diagnostics ---
+    "poll_interval":      {"name": "Poll Interval",      "device_class": SensorDeviceClass.DURATION, "unit": UnitOfTime.SECONDS, "state_class": SensorStateClass.MEASUREMENT, "entity_category": EntityCategory.DIAGNOSTIC, "enabled_default": False},
+    "tick_duration":      {"name": "Meter Tick Duration", "device_class": SensorDeviceClass.DURATION, "unit": UnitOfTime.MILLISECONDS, "state_class": SensorStateClass.MEASUREMENT, "entity_category": EntityCategory.DIAGNOSTIC, "enabled_default": False, "source": "stats"},
+    "error_rate":         {"name": "Meter Error Rate",   "device_class": None, "unit": PERCENTAGE, "state_class": SensorStateClass.MEASUREMENT, "entity_category": EntityCategory.DIAGNOSTIC, "enabled_default": False, "source": "stats"},
     # --- Slow (diagnostics, disabled by default) ---
-    "cpu_temperature":    {"name": "CPU Temperature",    "device_class": SensorDeviceClass.TEMPERATURE, "unit": UnitOfTemperature.CELSIUS, "state_class": SensorStateClass.MEASUREMENT, "entity_category": EntityCategory.DIAGNOSTIC, "enabled_default": False},
-    "board_temperature":  {"name": "Board Temperature",  "device_class": SensorDeviceClass.TEMPERATURE, "unit": UnitOfTemperature.CELSIUS, "state_class": SensorStateClass.MEASUREMENT, "entity_category": EntityCategory.DIAGNOSTIC, "enabled_default": False},
-    "firmware_version":   {"name": "Firmware Version",   "device_class": None, "unit": None, "state_class": None, "entity_category": EntityCategory.DIAGNOSTIC, "enabled_default": False},
-    "device_id":          {"name": "Device ID",          "device_class": None, "unit": None, "state_class": None, "entity_category": EntityCategory.DIAGNOSTIC, "enabled_default": False},
-    "unit_id":            {"name": "Unit ID",            "device_class": None, "unit": None, "state_class": None, "entity_category": EntityCategory.DIAGNOSTIC, "enabled_default": False},
-    "network_interface":  {"name": "Network Interface",  "device_class": None, "unit": None, "state_class": None, "entity_category": EntityCategory.DIAGNOSTIC, "enabled_default": False},
-    "ip_address":         {"name": "IP Address",         "device_class": None, "unit": None, "state_class": None, "entity_category": EntityCategory.DIAGNOSTIC, "enabled_default": False},
-    "wifi_ssid":          {"name": "Wi-Fi SSID",         "device_class": None, "unit": None, "state_class": None, "entity_category": EntityCategory.DIAGNOSTIC, "enabled_default": False},
-    "wifi_signal":        {"name": "Wi-Fi Signal",       "device_class": SensorDeviceClass.SIGNAL_STRENGTH, "unit": "dBm", "state_class": SensorStateClass.MEASUREMENT, "entity_category": EntityCategory.DIAGNOSTIC, "enabled_default": False},
-    "csms_status":        {"name": "CSMS Connection",    "device_class": None, "unit": None, "state_class": None, "entity_category": EntityCategory.DIAGNOSTIC, "enabled_default": False},
+    "cpu_temperature":    {"name": "CPU Temperature",    "device_class": SensorDeviceClass.TEMPERATURE, "unit": UnitOfTemperature.CELSIUS, "state_class": SensorStateClass.MEASUREMENT, "entity_category": EntityCategory.DIAGNOSTIC, "enabled_default": False, "source": "diagnostics"},
+    "board_temperature":  {"name": "Board Temperature",  "device_class": SensorDeviceClass.TEMPERATURE, "unit": UnitOfTemperature.CELSIUS, "state_class": SensorStateClass.MEASUREMENT, "entity_category": EntityCategory.DIAGNOSTIC, "enabled_default": False, "source": "diagnostics"},
+    "firmware_version":   {"name": "Firmware Version",   "device_class": None, "unit": None, "state_class": None, "entity_category": EntityCategory.DIAGNOSTIC, "enabled_default": False, "source": "diagnostics"},
+    "device_id":          {"name": "Device ID",          "device_class": None, "unit": None, "state_class": None, "entity_category": EntityCategory.DIAGNOSTIC, "enabled_default": False, "source": "diagnostics"},
+    "unit_id":            {"name": "Unit ID",            "device_class": None, "unit": None, "state_class": None, "entity_category": EntityCategory.DIAGNOSTIC, "enabled_default": False, "source": "diagnostics"},
+    "network_interface":  {"name": "Network Interface",  "device_class": None, "unit": None, "state_class": None, "entity_category": EntityCategory.DIAGNOSTIC, "enabled_default": False, "source": "diagnostics"},
+    "ip_address":         {"name": "IP Address",         "device_class": None, "unit": None, "state_class": None, "entity_category": EntityCategory.DIAGNOSTIC, "enabled_default": False, "source": "diagnostics"},
+    "wifi_ssid":          {"name": "Wi-Fi SSID",         "device_class": None, "unit": None, "state_class": None, "entity_category": EntityCategory.DIAGNOSTIC, "enabled_default": False, "source": "diagnostics"},
+    "wifi_signal":        {"name": "Wi-Fi Signal",       "device_class": SensorDeviceClass.SIGNAL_STRENGTH, "unit": "dBm", "state_class": SensorStateClass.MEASUREMENT, "entity_category": EntityCategory.DIAGNOSTIC, "enabled_default": False, "source": "diagnostics"},
+    "csms_status":        {"name": "CSMS Connection",    "device_class": None, "unit": None, "state_class": None, "entity_category": EntityCategory.DIAGNOSTIC, "enabled_default": False, "source": "diagnostics"},
+    # --- Signed OCMF reading (slow cadence, disabled by default) ---
+    "ocmf_energy":        {"name": "Verified Energy",    "device_class": SensorDeviceClass.ENERGY, "unit": UnitOfEnergy.KILO_WATT_HOUR, "state_class": SensorStateClass.TOTAL_INCREASING, "enabled_default": False, "source": "ocmf"},
+    "ocmf_status":        {"name": "OCMF Signature",     "device_class": SensorDeviceClass.ENUM, "unit": None, "state_class": None, "entity_category": EntityCategory.DIAGNOSTIC, "enabled_default": False, "source": "ocmf", "options": OCMF_STATUSES},
+}
+
+# --- Rolling statistics (disabled by default), unit and class taken from the source sensor ---
+SENSOR_MAP.update({
+    d.key: {
+        "name": d.name,
+        "device_class": SENSOR_MAP[d.source]["device_class"],
+        "unit": SENSOR_MAP[d.source]["unit"],
+        "state_class": SensorStateClass.MEASUREMENT,
+        "enabled_default": False,
+        "source": "stats",
+    }
+    for d in DERIVED
+})
+
+# --- Write throttling for live meter sensors: (option, default, "abs", "pct" or "band")
+# per device class. Energy registers are deliberately absent so every reading is written.
+DEADBAND_GROUPS = {
+    SensorDeviceClass.POWER:          (CONF_DEADBAND_POWER,   DEFAULT_DEADBAND_POWER,   "pct"),
+    SensorDeviceClass.REACTIVE_POWER: (CONF_DEADBAND_POWER,   DEFAULT_DEADBAND_POWER,   "pct"),
+    SensorDeviceClass.APPARENT_POWER: (CONF_DEADBAND_POWER,   DEFAULT_DEADBAND_POWER,   "pct"),
+    SensorDeviceClass.CURRENT:        (CONF_DEADBAND_CURRENT, DEFAULT_DEADBAND_CURRENT, "abs"),
+    SensorDeviceClass.VOLTAGE:        (CONF_DEADBAND_VOLTAGE, DEFAULT_DEADBAND_VOLTAGE, "abs"),
+}
+# Phase engine sensors only write when they cross into another threshold band
+PHASE_THRESHOLDS = {
+    **{key: (CONF_THRESHOLD_HEADROOM, DEFAULT_THRESHOLD_HEADROOM, "band") for key in ("headroom", *(f"headroom_{p}" for p in PHASES))},
+    "phase_imbalance": (CONF_THRESHOLD_IMBALANCE, DEFAULT_THRESHOLD_IMBALANCE, "band"),
+    "time_to_trip": (CONF_THRESHOLD_TIME_TO_TRIP, DEFAULT_THRESHOLD_TIME_TO_TRIP, "band"),
+}
+DEADBANDS = {
+    **{
+        key: DEADBAND_GROUPS[info["device_class"]]
+        for key, info in SENSOR_MAP.items()
+        if "source" not in info and info["device_class"] in DEADBAND_GROUPS
+    },
+    **PHASE_THRESHOLDS,
+    # Published with the phase values, but throttled like the meter's power sensors
+    "apparent_power": DEADBAND_GROUPS[SensorDeviceClass.APPARENT_POWER],
+}
+
+
+@dataclass(frozen=True, kw_only=True)
+class GaroSensorEntityDescription(SensorEntityDescription):
+    """A SENSOR_MAP entry; built once at import and shared by every unit and entry."""
+
+    source: str | None = None                          # coordinator, see GaroDevice.coordinator_for
+    deadband: tuple[str, float, str] | None = None     # DEADBAND_GROUPS entry
+
+
+SENSOR_DESCRIPTIONS = {
+    key: GaroSensorEntityDescription(
+        key=key,
+        name=info["name"],
+        device_class=info.get("device_class"),
+        native_unit_of_measurement=info.get("unit"),
+        state_class=info.get("state_class"),
+        entity_category=info.get("entity_category"),
+        entity_registry_enabled_default=info.get("enabled_default", True),
+        options=info.get("options"),
+        source=info.get("source"),
+        deadband=DEADBANDS.get(key),
+    )
+    for key, info in SENSOR_MAP.items()
 }
 
 
+async def _async_setup_device(hass, entry, client, hub_mode, opt) -> GaroDevice:
+    scan_interval = opt(CONF_SCAN_INTERVAL) or DEFAULT_SCAN_INTERVAL
+    slow_scan_interval = opt(CONF_SLOW_SCAN_INTERVAL) or DEFAULT_SLOW_SCAN_INTERVAL
+    if hub_mode:
+        # Namespaced per unit; single-device entries keep the original IDs
+        identifier = (DOMAIN, f"{entry.entry_id}_{client.host}")
+        unique_prefix, label = f"garo_{client.host}", client.host
+        storage_id = f"{entry.entry_id}_{client.host}"
+    else:
+        identifier, unique_prefix, label, storage_id = (DOMAIN, entry.entry_id), "garo", None, entry.entry_id
+
+    energy = GaroEnergyGuard(hass, storage_id)
+    await energy.async_load()
+    stats_interval = opt(CONF_STATS_INTERVAL) or DEFAULT_STATS_INTERVAL
+    meter = GaroMeterCoordinator(
+        hass, client, scan_interval, energy,
+        adaptive=bool(opt(CONF_ADAPTIVE_POLLING)), push=bool(opt(CONF_PUSH_MODE)), fuse=opt(CONF_FUSE_SIZE),
+        stats_interval=stats_interval,
+    )
+    stats = GaroStatsCoordinator(hass, meter, stats_interval)
+    identity = GaroIdentityCache(hass, storage_id)
+    await identity.async_load()
+    diagnostics = GaroDiagnosticsCoordinator(
+        hass, FetchEngine(client), slow_scan_interval, identity, identifier,
+    )
+    config = GaroConfigCoordinator(hass, client)
+    ocmf = GaroOcmfCoordinator(hass, client, slow_scan_interval)
+    return GaroDevice(client, meter, diagnostics, stats, identity, energy, config, ocmf, identifier, unique_prefix, label)
+
+
 async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry, async_add_entities: AddEntitiesCallback):
     data = hass.data[DOMAIN][entry.entry_id]
+    hub_mode = bool(entry.data.get(CONF_HUB))
 
     def opt(key):
         return entry.options.get(key, entry.data.get(key))
 
-    host = opt(CONF_HOST)
-    username = opt(CONF_USERNAME)
-    password = opt(CONF_PASSWORD)
-    scan_interval = opt(CONF_SCAN_INTERVAL) or DEFAULT_SCAN_INTERVAL
-    slow_scan_interval = opt(CONF_SLOW_SCAN_INTERVAL) or DEFAULT_SLOW_SCAN_INTERVAL
-    ignore_tls = opt(CONF_IGNORE_TLS_ERRORS)
-    use_http = opt(CONF_USE_HTTP)
-
-    scheme = "http" if use_http else "https"
-    base_url         = f"{scheme}://{host}{API_PATH}"
-    temp_url         = f"{scheme}://{host}{API_PATH_TEMPS}"
-    firmware_url     = f"{scheme}://{host}{API_PATH_FIRMWARE_VERSION}"
-    device_id_url    = f"{scheme}://{host}{API_PATH_DEVICE_ID}"
-    unit_id_url      = f"{scheme}://{host}{API_PATH_UNIT_ID}"
-    net_iface_url    = f"{scheme}://{host}{API_PATH_NETWORK_INTERFACE}"
-    conn_status_url  = f"{scheme}://{host}{API_PATH_CONNECTION_STATUS}"
-    csms_url         = f"{scheme}://{host}{API_PATH_CSMS_STATUS}"
-
-    session = data.get("session") or aiohttp_client.async_get_clientsession(hass, verify_ssl=not ignore_tls)
-
-    def _extract_simple(payload):
-        if isinstance(payload, dict):
-            return next(iter(payload.values()), None)
-        return payload
-
-    _slow_modulo = max(1, round(slow_scan_interval / scan_interval))
+    devices: list[GaroDevice] = [
+        await _async_setup_device(hass, entry, client, hub_mode, opt) for client in data["clients"]
+    ]
     _LOGGER.info(
-        "Poll intervals: fast=%ds slow=%ds (slow fires every %d fast ticks)",
-        scan_interval, slow_scan_interval, _slow_modulo,
-    )
-    _slow_cache: dict = {}
-    _slow_counter = [_slow_modulo - 1]
-
-    async def _async_update_data():
-        _slow_counter[0] += 1
-        if _slow_counter[0] >= _slow_modulo:
-            _slow_counter[0] = 0
-
-            # --- Temperatures ---
-            try:
-                async with asyncio.timeout(10):
-                    async with session.get(temp_url, auth=aiohttp.BasicAuth(username, password)) as resp:
-                        if resp.status == 200:
-                            try:
-                                temps = await resp.json(content_type=None)
-                            except Exception:
-                                _LOGGER.warning("Temp JSON decode failed")
-                            else:
-                                _LOGGER.debug("Temperatures raw=%r", temps)
-                                if isinstance(temps, dict):
-                                    cpu = temps.get("cpu")
-                                    board = (
-                                        temps.get("base_board") or temps.get("board")
-                                        or temps.get("baseboard") or temps.get("pcb")
-                                    )
-                                    if isinstance(cpu, (int, float)):
-                                        _slow_cache["cpu_temperature"] = float(cpu)
-                                    if isinstance(board, (int, float)):
-                                        _slow_cache["board_temperature"] = float(board)
-            except Exception as e:
-                _LOGGER.debug("Temperature fetch failed: %s", e)
-
-            # --- Firmware version, device ID, unit ID ---
-            for label, url, key in (
-                ("firmware_version", firmware_url, "firmware_version"),
-                ("device_id",        device_id_url, "device_id"),
-                ("unit_id",          unit_id_url,   "unit_id"),
-            ):
-                try:
-                    async with asyncio.timeout(10):
-                        async with session.get(url, auth=aiohttp.BasicAuth(username, password)) as resp:
-                            if resp.status == 200:
-                                try:
-                                    raw = await resp.json(content_type=None)
-                                except Exception:
-                                    raw = await resp.text()
-                                val = _extract_simple(raw)
-                                if val is not None:
-                                    _slow_cache[key] = str(val)
-                            else:
-                                _LOGGER.debug("%s endpoint status %s", label, resp.status)
-                except Exception as e:
-                    _LOGGER.debug("%s fetch failed: %s", label, e)
-
-            # --- Network interface ---
-            try:
-                async with asyncio.timeout(10):
-                    async with session.get(net_iface_url, auth=aiohttp.BasicAuth(username, password)) as resp:
-                        if resp.status == 200:
-                            try:
-                                raw = await resp.json(content_type=None)
-                            except Exception:
-                                raw = await resp.text()
-                            val = _extract_simple(raw)
-                            if val is not None:
-                                _slow_cache["network_interface"] = str(val)
-            except Exception as e:
-                _LOGGER.debug("network_interface fetch failed: %s", e)
-
-            # --- Connection status (IP, WiFi) ---
-            try:
-                async with asyncio.timeout(10):
-                    async with session.get(conn_status_url, auth=aiohttp.BasicAuth(username, password)) as resp:
-                        if resp.status == 200:
-                            try:
-                                raw = await resp.json(content_type=None)
-                            except Exception:
-                                pass
-                            else:
-                                if isinstance(raw, dict):
-                                    for k in ("ip_address", "ip", "address", "ipv4"):
-                                        if k in raw:
-                                            _slow_cache["ip_address"] = str(raw[k])
-                                            break
-                                    for k in ("ssid", "SSID", "wifi_ssid"):
-                                        if k in raw:
-                                            _slow_cache["wifi_ssid"] = str(raw[k])
-                                            break
-                                    for k in ("rssi", "RSSI", "signal", "signal_strength"):
-                                        if k in raw:
-                                            try:
-                                                _slow_cache["wifi_signal"] = float(raw[k])
-                                            except (ValueError, TypeError):
-                                                pass
-                                            break
-            except Exception as e:
-                _LOGGER.debug("connection_status fetch failed: %s", e)
-
-            # --- CSMS connection status ---
-            try:
-                async with asyncio.timeout(10):
-                    async with session.get(csms_url, auth=aiohttp.BasicAuth(username, password)) as resp:
-                        if resp.status == 200:
-                            try:
-                                raw = await resp.json(content_type=None)
-                            except Exception:
-                                raw = await resp.text()
-                            _LOGGER.debug("csms_status raw=%r", raw)
-                            if isinstance(raw, dict):
-                                status = raw.get("status") or raw.get("connected") or raw.get("state")
-                                if status is not None:
-                                    _slow_cache["csms_status"] = str(status)
-                            elif raw is not None:
-                                _slow_cache["csms_status"] = str(_extract_simple(raw) or raw)
-            except Exception as e:
-                _LOGGER.debug("csms_status fetch failed: %s", e)
-
-        # Merge slow cache then fetch fast data
-        result = dict(_slow_cache)
-
-        # --- Energy meter ---
-        try:
-            async with asyncio.timeout(15):
-                async with session.get(base_url, auth=aiohttp.BasicAuth(username, password)) as resp:
-                    text = await resp.text()
-                    if resp.status != 200:
-                        _LOGGER.warning("Status %s from %s: %s", resp.status, base_url, text[:120])
-                    else:
-                        try:
-                            payload = await resp.json(content_type=None)
-                        except Exception:
-                            _LOGGER.error("JSON decode failed URL=%s raw=%s", base_url, text[:120])
-                        else:
-                            for block in payload:
-                                for sv in block.get("sampledValue", []):
-                                    meas = sv.get("measurand")
-                                    phase = sv.get("phase")
-                                    raw = sv.get("value")
-                                    if raw is None:
-                                        continue
-                                    try:
-                                        val = float(raw)
-                                    except (ValueError, TypeError):
-                                        continue
-                                    if meas == "Current.Import":
-                                        if phase == "L1": result["current_l1"] = val
-                                        elif phase == "L2": result["current_l2"] = val
-                                        elif phase == "L3": result["current_l3"] = val
-                                    elif meas == "Voltage":
-                                        if phase == "L1-N": result["voltage_l1"] = val
-                                        elif phase == "L2-N": result["voltage_l2"] = val
-                                        elif phase == "L3-N": result["voltage_l3"] = val
-                                    elif meas == "Energy.Active.Import.Register":
-                                        prev = (coordinator.data or {}).get("energy")
-                                        if prev is not None and val < prev:
-                                            _LOGGER.warning("Energy counter decreased (%.1f -> %.1f), keeping previous", prev, val)
-                                            val = prev
-                                        result["energy"] = val
-                                    elif meas == "Power.Active.Import":
-                                        result["power"] = val
-        except Exception as e:
-            _LOGGER.warning("Energy meter fetch failed: %s", e)
-
-        return result
-
-    coordinator = DataUpdateCoordinator(
-        hass,
-        _LOGGER,
-        name="garo_entity_balance_meter",
-        update_method=_async_update_data,
-        update_interval=timedelta(seconds=scan_interval),
+        "Poll intervals: fast=%ds slow=%ds, %d unit(s)",
+        devices[0].meter.base_interval.total_seconds(), devices[0].diagnostics.base_interval.total_seconds(), len(devices),
     )
-    data["coordinator"] = coordinator
-    await coordinator.async_config_entry_first_refresh()
 
+    # Before seeding: the seed schedules each unit's next poll from its (staggered) interval
+    data["hub"].stagger([device.meter for device in devices])
+    # The rest refresh in the background, each unit at its own offset within the interval
+    for source in ("diagnostics", "config", "ocmf"):
+        data["hub"].stagger_first_refresh([getattr(device, source) for device in devices])
+
+    for device in devices:
+        data["devices"][device.client.host] = device
+        # The setup probe already fetched the meter; only refresh if that sample is gone
+        sample = device.client.pop_first_sample()
+        if sample is not None:
+            device.meter.async_seed(sample)
+        elif hub_mode:
+            await device.meter.async_refresh()
+        else:
+            await device.meter.async_config_entry_first_refresh()
+
+        if opt(CONF_PUSH_MODE):
+            GaroEventStream(hass, device.client, device.meter).async_start(entry)
+
+    deadbands = {}
+    for option, default, mode in set(DEADBANDS.values()):
+        value = opt(option)
+        value = default if value is None else value
+        deadbands[option] = (value, mode) if value else None
+    max_age = opt(CONF_MAX_STATE_AGE) or DEFAULT_MAX_STATE_AGE
+
+    # Entities the user disabled are never built; enabling one reloads the entry
+    registry = er.async_get(hass)
     async_add_entities(
-        GaroBalanceSensor(coordinator, entry, host, key)
-        for key in SENSOR_MAP
+        GaroBalanceSensor(
+            device.coordinator_for(description.source), device, description,
+            deadband=deadbands[description.deadband[0]] if description.deadband else None, max_age=max_age,
+        )
+        for device in devices
+        for description in SENSOR_DESCRIPTIONS.values()
+        if not _registry_disabled(registry, f"{device.unique_prefix}_{description.key}")
     )
+    for device in devices:
+        entry.async_on_unload(_async_track_config_parameters(hass, device, async_add_entities))
+        # Without a listener the diagnostics coordinator is never rescheduled, and
+        # the device info would miss firmware changes and the daily identity check
+        entry.async_on_unload(device.diagnostics.async_add_listener(_async_identity_listener))
+    # Diagnostics only feed disabled-by-default entities and device info (served
+    # from the identity cache), so startup does not wait for them. Staggered, a
+    # large hub never queues every unit's slow batch on the shared limiter at once.
+    for device in devices:
+        device.diagnostics.async_refresh_later()
+        device.config.async_refresh_later()
+
+
+@callback
+def _async_identity_listener() -> None:
+    """Context-less diagnostics listener; the coordinator updates the device registry itself."""
 
 
-class GaroBalanceSensor(CoordinatorEntity, SensorEntity):
+def _registry_disabled(registry: er.EntityRegistry, unique_id: str) -> bool:
+    entity_id = registry.async_get_entity_id("sensor", DOMAIN, unique_id)
+    return entity_id is not None and registry.entities[entity_id].disabled
 
-    def __init__(self, coordinator, entry, host, key):
-        super().__init__(coordinator)
-        self._key = key
-        self._entry = entry
-        self._host = host
-        info = SENSOR_MAP[key]
-        self._attr_name = info["name"]
-        self._attr_unique_id = f"garo_{key}"
-        self._attr_device_class = info.get("device_class")
-        self._attr_native_unit_of_measurement = info.get("unit")
-        self._attr_state_class = info.get("state_class")
-        self._attr_entity_category = info.get("entity_category")
-        self._attr_entity_registry_enabled_default = info.get("enabled_default", True)
+
+@callback
+def _async_track_config_parameters(hass: HomeAssistant, device: GaroDevice, async_add_entities: AddEntitiesCallback):
+    """Add a sensor for every config parameter the first time it shows up in a snapshot.
+
+    The listener keeps the config coordinator scheduled; whether a scheduled
+    snapshot is actually read is up to the coordinator.
+    """
+    known: set[tuple[str, str]] = set()
+    registry = er.async_get(hass)
+
+    @callback
+    def _async_add_new() -> None:
+        new = [
+            (group, parameter)
+            for group, params in (device.config.data or {}).items()
+            for parameter in params
+            if (group, parameter) not in known
+        ]
+        if new:
+            known.update(new)
+            async_add_entities(
+                GaroConfigSensor(device, group, parameter)
+                for group, parameter in new
+                if not _registry_disabled(registry, GaroConfigSensor.unique_id_for(device, group, parameter))
+            )
+
+    return device.config.async_add_listener(_async_add_new)
+
+
+class GaroEntity(CoordinatorEntity):
+    """Shared device info and availability for the entities of one unit."""
+
+    def __init__(self, coordinator, device: GaroDevice, context=None):
+        super().__init__(coordinator, context)
+        self._device = device
+
+    async def async_added_to_hass(self) -> None:
+        await super().async_added_to_hass()
+        self.async_on_remove(self._device.client.breaker.add_listener(self.async_write_ha_state))
 
     @property
-    def native_value(self):
-        return (self.coordinator.data or {}).get(self._key)
+    def available(self) -> bool:
+        # Unavailable as soon as the unit is unreachable, not after the next failed poll
+        return super().available and self._device.client.breaker.closed
 
     @property
     def device_info(self) -> DeviceInfo:
-        entry_data = self.coordinator.hass.data[DOMAIN][self._entry.entry_id]
-        scheme = "http" if entry_data.get("use_http") else "https"
-        coord_data = self.coordinator.data or {}
-        device_id = coord_data.get("device_id")
-        unit_id = coord_data.get("unit_id")
-        fw = coord_data.get("firmware_version")
-
-        connections: set = set()
-        if unit_id and "-" in unit_id:
-            mac_raw = unit_id.split("-")[-1]
-            if len(mac_raw) == 12 and all(c in "0123456789ABCDEFabcdef" for c in mac_raw):
-                mac = ":".join(mac_raw[i:i+2] for i in range(0, 12, 2))
-                connections.add((dr.CONNECTION_NETWORK_MAC, mac.upper()))
+        identity = self._device.identity
 
         return DeviceInfo(
-            identifiers={(DOMAIN, self._entry.entry_id)},
-            connections=connections,
+            identifiers={self._device.identifier},
+            connections=identity.connections,
             manufacturer=MANUFACTURER,
-            name=PRODUCT_NAME,
+            name=f"{PRODUCT_NAME} {self._device.label}" if self._device.label else PRODUCT_NAME,
             model="Entity Balance",
-            serial_number=device_id,
-            sw_version=fw,
-            configuration_url=f"{scheme}://{self._host}",
+            serial_number=identity.values.get("device_id"),
+            sw_version=identity.values.get("firmware_version"),
+            configuration_url=self._device.client.base_url,
         )
+
+
+class GaroBalanceSensor(GaroEntity, SensorEntity):
+
+    entity_description: GaroSensorEntityDescription
+    # Energy Total attributes that move with every reading; kept out of the recorder
+    _unrecorded_attributes = frozenset({"confidence", "last_good"})
+
+    def __init__(self, coordinator, device: GaroDevice, description: GaroSensorEntityDescription, *, deadband: tuple[float, str] | None = None, max_age: float = DEFAULT_MAX_STATE_AGE):
+        # The key as listener context tells the diagnostics coordinator which endpoints are in use
+        super().__init__(coordinator, device, context=description.key)
+        self.entity_description = description
+        self._key = description.key
+        self._deadband = deadband
+        self._max_age = max_age
+        self._written = None
+        self._written_available = None
+        self._written_at = 0.0
+        if device.label:
+            self._attr_name = f"{device.label} {description.name}"
+        self._attr_unique_id = f"{device.unique_prefix}_{description.key}"
+
+    @property
+    def native_value(self):
+        return (self.coordinator.data or {}).get(self._key)
+
+    @property
+    def extra_state_attributes(self):
+        if self._key == "energy":
+            return self._device.energy.attributes
+        if self._key == "ocmf_energy":
+            return {"reading_time": (self.coordinator.data or {}).get("ocmf_time")}
+        return None
+
+    def _significant(self, value, now: float) -> bool:
+        """Whether ``value`` moved past the deadband since the last written state."""
+        last = self._written
+        if value is None or last is None or self.available != self._written_available:
+            return value != last or self.available != self._written_available
+        if now - self._written_at >= self._max_age:
+            return True
+        limit, mode = self._deadband
+        if mode == "band":
+            return math.floor(value / limit) != math.floor(last / limit)
+        if mode == "pct":
+            limit = abs(last) * limit / 100
+        return abs(value - last) > limit
+
+    @callback
+    def _handle_coordinator_update(self) -> None:
+        """Write state, skipping changes inside the sensor's deadband (see DEADBANDS)."""
+        if self._deadband is not None:
+            value, now = self.native_value, time.monotonic()
+            if not self._significant(value, now):
+                return
+            self._written, self._written_available, self._written_at = value, self.available, now
+        super()._handle_coordinator_update()
+
+
+class GaroConfigSensor(GaroEntity, SensorEntity):
+    """One /config/config-parameter value; written only when the snapshot diff touches it."""
+
+    _attr_entity_category = EntityCategory.DIAGNOSTIC
+    _attr_entity_registry_enabled_default = False
+
+    def __init__(self, device: GaroDevice, group: str, parameter: str):
+        super().__init__(device.config, device, (group, parameter))
+        self._group = group
+        self._parameter = parameter
+        name = f"Config {group} {parameter}"
+        self._attr_name = f"{device.label} {name}" if device.label else name
+        self._attr_unique_id = self.unique_id_for(device, group, parameter)
+        self._written_available = None
+
+    @staticmethod
+    def unique_id_for(device: GaroDevice, group: str, parameter: str) -> str:
+        return f"{device.unique_prefix}_config_{group}_{parameter}"
+
+    @property
+    def native_value(self):
+        return (self.coordinator.data or {}).get(self._group, {}).get(self._parameter)
+
+    @callback
+    def _handle_coordinator_update(self) -> None:
+        available = self.available
+        if (self._group, self._parameter) in self.coordinator.changes or available != self._written_available:
+            self._written_available = available
+            super()._handle_coordinator_update()
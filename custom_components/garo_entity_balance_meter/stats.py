@@ -0,0 +1,156 @@
+"""Rolling statistics over recent meter samples, kept in compact ring buffers.
+
+The ``DERIVED`` spec names each windowed value (mean, min, max or
+percentile of one measurand) and ``MeterStats`` keeps one window per
+measurand and window length, shared by every value that reads it.
+"""
+from __future__ import annotations
+from array import array
+from collections import deque
+from typing import Any, NamedTuple
+
+
+class Derived(NamedTuple):
+    key: str
+    source: str
+    window: int          # seconds
+    stat: str            # "mean", "min", "max" or "pNN"
+    name: str
+
+
+DERIVED: tuple[Derived, ...] = (
+    Derived("power_avg_1m",       "power",      60,  "mean", "Power 1 min Average"),
+    Derived("power_avg_15m",      "power",      900, "mean", "Power 15 min Average"),
+    Derived("power_peak_15m",     "power",      900, "max",  "Power 15 min Peak"),
+    Derived("power_p95_15m",      "power",      900, "p95",  "Power 15 min 95th Percentile"),
+    Derived("current_l1_peak_15m", "current_l1", 900, "max", "Current L1 15 min Peak"),
+    Derived("current_l2_peak_15m", "current_l2", 900, "max", "Current L2 15 min Peak"),
+    Derived("current_l3_peak_15m", "current_l3", 900, "max", "Current L3 15 min Peak"),
+)
+
+
+class RollingWindow:
+    """Time-windowed samples of one measurand in a fixed-size ring.
+
+    Adding a sample and expiring old ones is amortised O(1): the sum is kept
+    running and min/max come from monotonic deques. Percentiles sort the
+    live window, so they are only computed when stats are published, not
+    per sample.
+    """
+
+    __slots__ = ("window", "_times", "_values", "_head", "_count", "_seq", "_sum", "_min_q", "_max_q")
+
+    def __init__(self, window: float, capacity: int) -> None:
+        self.window = window
+        self._times = array("d", bytes(8 * capacity))
+        self._values = array("d", bytes(8 * capacity))
+        self._head = 0       # next write position
+        self._count = 0
+        self._seq = 0        # total samples ever added; seq of the oldest live one is _seq - _count
+        self._sum = 0.0
+        self._min_q: deque[tuple[int, float]] = deque()
+        self._max_q: deque[tuple[int, float]] = deque()
+
+    def __len__(self) -> int:
+        return self._count
+
+    def _pop_oldest(self) -> None:
+        capacity = len(self._values)
+        tail = (self._head - self._count) % capacity
+        oldest_seq = self._seq - self._count
+        self._sum -= self._values[tail]
+        self._count -= 1
+        if self._min_q and self._min_q[0][0] == oldest_seq:
+            self._min_q.popleft()
+        if self._max_q and self._max_q[0][0] == oldest_seq:
+            self._max_q.popleft()
+
+    def expire(self, now: float) -> None:
+        capacity = len(self._values)
+        cutoff = now - self.window
+        while self._count and self._times[(self._head - self._count) % capacity] < cutoff:
+            self._pop_oldest()
+
+    def add(self, now: float, value: float) -> None:
+        self.expire(now)
+        if self._count == len(self._values):
+            self._pop_oldest()
+        self._times[self._head] = now
+        self._values[self._head] = value
+        self._head = (self._head + 1) % len(self._values)
+        self._count += 1
+        self._sum += value
+        seq = self._seq
+        self._seq += 1
+        while self._min_q and self._min_q[-1][1] >= value:
+            self._min_q.pop()
+        self._min_q.append((seq, value))
+        while self._max_q and self._max_q[-1][1] <= value:
+            self._max_q.pop()
+        self._max_q.append((seq, value))
+
+    def values(self) -> list[float]:
+        capacity = len(self._values)
+        start = self._head - self._count
+        return [self._values[i % capacity] for i in range(start, self._head)]
+
+    def mean(self) -> float | None:
+        return self._sum / self._count if self._count else None
+
+    def min(self) -> float | None:
+        return self._min_q[0][1] if self._count else None
+
+    def max(self) -> float | None:
+        return self._max_q[0][1] if self._count else None
+
+    def percentile(self, pct: float) -> float | None:
+        if not self._count:
+            return None
+        ordered = sorted(self.values())
+        rank = pct / 100 * (len(ordered) - 1)
+        low = int(rank)
+        high = min(low + 1, len(ordered) - 1)
+        return ordered[low] + (ordered[high] - ordered[low]) * (rank - low)
+
+
+class MeterStats:
+    """One rolling window per (measurand, window) pair used by the derived spec."""
+
+    def __init__(self, min_interval: float, spec: tuple[Derived, ...] = DERIVED) -> None:
+        self._spec = spec
+        self._windows: dict[tuple[str, int], RollingWindow] = {}
+        for d in spec:
+            if (d.source, d.window) not in self._windows:
+                # Room for every sample at the fastest possible poll rate
+                self._windows[(d.source, d.window)] = RollingWindow(d.window, int(d.window / min_interval) + 2)
+        self._by_source: dict[str, list[RollingWindow]] = {}
+        for (source, _), window in self._windows.items():
+            self._by_source.setdefault(source, []).append(window)
+
+    def window(self, source: str, window: int) -> RollingWindow | None:
+        return self._windows.get((source, window))
+
+    def add(self, now: float, values: dict[str, Any]) -> None:
+        for source, windows in self._by_source.items():
+            value = values.get(source)
+            if value is None:
+                continue
+            for window in windows:
+                window.add(now, value)
+
+    def snapshot(self, now: float) -> dict[str, float | None]:
+        for window in self._windows.values():
+            window.expire(now)
+        result: dict[str, float | None] = {}
+        for d in self._spec:
+            window = self._windows[(d.source, d.window)]
+            if d.stat == "mean":
+                val = window.mean()
+            elif d.stat == "min":
+                val = window.min()
+            elif d.stat == "max":
+                val = window.max()
+            else:
+                val = window.percentile(float(d.stat[1:]))
+            result[d.key] = round(val, 3) if val is not None else None
+        return result
@@ -0,0 +1,129 @@
+"""Push mode: read meter updates from the /hal/output event stream."""
+from __future__ import annotations
+import logging, asyncio
+from typing import Any
+
+import aiohttp
+
+from homeassistant.config_entries import ConfigEntry
+from homeassistant.core import HomeAssistant, callback
+
+from .const import (
+    API_PATH_HAL_OUTPUT,
+    STREAM_STALL_TIMEOUT, STREAM_BACKOFF_MIN, STREAM_BACKOFF_MAX,
+)
+from .client import GaroClient, json_loads
+from .coordinator import GaroMeterCoordinator
+from .parser import parse_meter_payload
+
+_LOGGER = logging.getLogger(__name__)
+
+
+def parse_event_line(line: bytes) -> dict[str, Any] | None:
+    """Parse one event line into meter values, or None if it carries none.
+
+    The stream format is not documented beyond "text/plain"; lines holding
+    energy-meter style JSON (a block or list of blocks with sampledValue)
+    are used and everything else is ignored.
+    """
+    line = line.strip()
+    if not line or line[:1] not in (b"{", b"["):
+        return None
+    try:
+        event = json_loads(line)
+    except ValueError:
+        return None
+    if isinstance(event, dict) and "sampledValue" not in event:
+        return None
+    try:
+        values = parse_meter_payload(event)
+    except AttributeError:
+        return None
+    return values or None
+
+
+class GaroEventStream:
+    """Hold one long-lived /hal/output connection and push meter updates.
+
+    Polling on the meter coordinator is paused while events arrive and
+    resumed whenever no meter event has been seen for ``stall_timeout``
+    seconds, so the poll path remains the fallback. An accepted connection
+    or an event closes the client's breaker: with polling paused nothing
+    else would probe it.
+    """
+
+    def __init__(
+        self,
+        hass: HomeAssistant,
+        client: GaroClient,
+        meter: GaroMeterCoordinator,
+        *,
+        stall_timeout: float = STREAM_STALL_TIMEOUT,
+        backoff_min: float = STREAM_BACKOFF_MIN,
+        backoff_max: float = STREAM_BACKOFF_MAX,
+    ) -> None:
+        self._hass = hass
+        self._client = client
+        self._url = f"{client.base_url}{API_PATH_HAL_OUTPUT}"
+        self._meter = meter
+        self._stall_timeout = stall_timeout
+        self._backoff_min = backoff_min
+        self._backoff_max = backoff_max
+        self._backoff = backoff_min
+        self._watchdog: asyncio.TimerHandle | None = None
+        self.events = 0
+
+    @callback
+    def async_start(self, entry: ConfigEntry) -> None:
+        entry.async_create_background_task(self._hass, self._async_run(), f"{self._url} stream")
+        entry.async_on_unload(self._async_stop_watchdog)
+
+    async def _async_run(self) -> None:
+        while True:
+            try:
+                await self._async_consume()
+                _LOGGER.debug("Event stream %s closed by device", self._url)
+            except (aiohttp.ClientError, asyncio.TimeoutError) as err:
+                _LOGGER.debug("Event stream %s failed: %s", self._url, err)
+            self._async_stalled()
+            await asyncio.sleep(self._backoff)
+            self._backoff = min(self._backoff * 2, self._backoff_max)
+
+    async def _async_consume(self) -> None:
+        # sock_read bounds the silence between chunks; total must stay unset for an endless body
+        timeout = aiohttp.ClientTimeout(total=None, sock_connect=10, sock_read=self._stall_timeout)
+        async with self._client.open_hal_output(timeout) as resp:
+            if resp.status != 200:
+                raise aiohttp.ClientResponseError(
+                    resp.request_info, resp.history, status=resp.status, message="event stream rejected",
+                )
+            self._client.breaker.record_success()
+            buf = b""
+            async for chunk in resp.content.iter_any():
+                buf += chunk
+                *lines, buf = buf.split(b"\n")
+                for line in lines:
+                    values = parse_event_line(line)
+                    if values:
+                        self._async_handle_values(values)
+
+    @callback
+    def _async_handle_values(self, values: dict[str, Any]) -> None:
+        self.events += 1
+        self._backoff = self._backoff_min
+        self._client.breaker.record_success()
+        self._async_stop_watchdog()
+        self._watchdog = self._hass.loop.call_later(self._stall_timeout, self._async_stalled)
+        self._meter.async_pause_polling()
+        self._meter.async_push(values)
+
+    @callback
+    def _async_stalled(self) -> None:
+        self._async_stop_watchdog()
+        self._meter.async_resume_polling()
+
+    @callback
+    def _async_stop_watchdog(self) -> None:
+        if self._watchdog is not None:
+            self._watchdog.cancel()
+            self._watchdog = None